@@ -1,10 +1,14 @@
 from PyInstaller.utils.hooks import collect_submodules
 
-hiddenimports = collect_submodules('selenium') + collect_submodules('pandas')
+hiddenimports = (
+    collect_submodules('selenium')
+    + collect_submodules('pandas')
+    + ['Pipeline.session_cache', 'Pipeline.traffic_client']
+)
 
 a = Analysis(
     ['app.py'],
-    pathex=[],
+    pathex=['../ventas/dodo_traffic'],  # Pipeline compartido (sesión y cliente de Traffic)
     binaries=[],
     datas=[],  # vacío o con archivos reales
     hiddenimports=hiddenimports,
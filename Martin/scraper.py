@@ -5,7 +5,20 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import datetime, logging, requests, time
+import datetime, logging, asyncio, sys
+import httpx
+
+# Módulos compartidos con el pipeline de ventas (sesión y cliente de Traffic)
+PIPELINE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "ventas",
+    "dodo_traffic",
+)
+if PIPELINE_DIR not in sys.path:
+    sys.path.append(PIPELINE_DIR)
+
+from Pipeline.session_cache import SessionCache
+from Pipeline.traffic_client import TrafficClient, COSTO_RESERVA
 
 
 def setup_logging():
@@ -39,89 +52,72 @@ def main(
     TRAFFIC_PASSWORD: str = os.getenv("TRAFFIC_PASSWORD")
     URL_DATA_TRAFFIC_COSTORESERVA: str = os.getenv("URL_DATA_TRAFFIC_COSTORESERVA")
 
-    options = webdriver.ChromeOptions()
-    options.add_argument("--start-maximized")  # maximiza ventana
-    options.add_argument("--headless")  # modo headless
-    options.add_argument("--disable-gpu")  # recomendado en headless
-    options.add_argument("--window-size=1920,1080")  # tamaño de la ventana"""
+    def login() -> list[dict]:
+        options = webdriver.ChromeOptions()
+        options.add_argument("--start-maximized")  # maximiza ventana
+        options.add_argument("--headless")  # modo headless
+        options.add_argument("--disable-gpu")  # recomendado en headless
+        options.add_argument("--window-size=1920,1080")  # tamaño de la ventana"""
+
+        driver = webdriver.Chrome(options=options)
+
+        driver.get(URL_LOGIN_TRAFFIC)
+        logger.info("=" * 60)
+        logger.info("Abriendo página de login de traffic...")
+        wait = WebDriverWait(driver, 15)
+        wait.until(
+            EC.presence_of_element_located(
+                (By.ID, "Softur_Serene_Membership_LoginPanel0_Username")
+            )
+        ).send_keys(TRAFFIC_USERNAME)
 
-    driver = webdriver.Chrome(options=options)
+        wait.until(
+            EC.presence_of_element_located(
+                (By.ID, "Softur_Serene_Membership_LoginPanel0_Password")
+            )
+        ).send_keys(TRAFFIC_PASSWORD)
 
-    driver.get(URL_LOGIN_TRAFFIC)
-    logger.info("=" * 60)
-    logger.info("Abriendo página de login de traffic...")
-    wait = WebDriverWait(driver, 15)
-    wait.until(
-        EC.presence_of_element_located(
-            (By.ID, "Softur_Serene_Membership_LoginPanel0_Username")
-        )
-    ).send_keys(TRAFFIC_USERNAME)
-
-    wait.until(
-        EC.presence_of_element_located(
-            (By.ID, "Softur_Serene_Membership_LoginPanel0_Password")
-        )
-    ).send_keys(TRAFFIC_PASSWORD)
-
-    wait.until(
-        EC.element_to_be_clickable(
-            (By.ID, "Softur_Serene_Membership_LoginPanel0_LoginButton")
-        )
-    ).click()
-    # Cookies obtenidas de Selenium
-    wait.until(EC.url_changes(URL_LOGIN_TRAFFIC))
-
-    logger.info("Ingreso.")
+        wait.until(
+            EC.element_to_be_clickable(
+                (By.ID, "Softur_Serene_Membership_LoginPanel0_LoginButton")
+            )
+        ).click()
+        # Cookies obtenidas de Selenium
+        wait.until(EC.url_changes(URL_LOGIN_TRAFFIC))
+
+        logger.info("Ingreso.")
+        selenium_cookies = driver.get_cookies()
+        driver.quit()
+        return selenium_cookies
+
+    # Reutiliza la sesión guardada; Chrome solo arranca si no hay o fue rechazada
+    cache = SessionCache(
+        os.getenv("TRAFFIC_SESSION_CACHE", "traffic_session.bin"), TRAFFIC_PASSWORD
+    )
+    cookies = cache.get_cookies(login, URL_DATA_TRAFFIC_COSTORESERVA, logger)
 
     FECHA_RESERVA_INICIO: str = datetime.date(1990, 1, 1).strftime("%Y-%m-%d")
     FECHA_RESERVA_HOY: str = datetime.datetime.now().date().strftime("%Y-%m-%d")
 
-    headers = {
-        "Accept": "application/json, text/javascript, */*; q=0.01",
-        "Content-Type": "application/json",
-        "X-Requested-With": "XMLHttpRequest",
-        "Origin": "https://traffic.welcomelatinamerica.com",
-        "Referer": "https://traffic.welcomelatinamerica.com/iTraffic_TSA/Z_Reportes/CostoReserva_List",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36",
+    body = {
+        "fec_rvadesde": FECHA_RESERVA_INICIO,
+        "fec_rvahasta": FECHA_RESERVA_HOY,
+        "fec_Saldesde": FECHA_VIAJE_DESDE,
+        "fec_Salhasta": FECHA_VIAJE_HASTA,
+        "fec_Indesde": FECHA_IN_DESDE,
+        "fec_Inhasta": FECHA_IN_HASTA,
     }
-    selenium_cookies = driver.get_cookies()
-    cookies = {c["name"]: c["value"] for c in selenium_cookies}
-
-    all_data: list = []
-    skip = 0
-    while True:
-        try:
-            payload = {
-                "Take": 2500,
-                "Skip": skip,
-                "fec_rvadesde": FECHA_RESERVA_INICIO,
-                "fec_rvahasta": FECHA_RESERVA_HOY,
-                "fec_Saldesde": FECHA_VIAJE_DESDE,
-                "fec_Salhasta": FECHA_VIAJE_HASTA,
-                "fec_Indesde": FECHA_IN_DESDE,
-                "fec_Inhasta": FECHA_IN_HASTA,
-            }
-
-            response = requests.post(
-                URL_DATA_TRAFFIC_COSTORESERVA,
-                headers=headers,
-                cookies=cookies,
-                json=payload,
-            )
-            if response.status_code != 200:
-                logger.error(
-                    f"Error en la solicitud: {response.status_code} - {response.text}"
-                )
-                return pd.DataFrame()
-            data_batch: dict = response.json().get("Entities", [])
-            if not data_batch:
-                logger.info("No hay más datos para descargar. Fin del scraping.")
-                break
-            all_data.extend(data_batch)
-            skip += 2500
-            logger.info(f"Registros descargados hasta ahora: {len(all_data)}")
-        finally:
-            driver.quit()
+
+    async def descargar() -> list[dict]:
+        async with TrafficClient(cookies, max_connections=4, logger=logger) as client:
+            return await client.fetch_all(COSTO_RESERVA, body)
+
+    try:
+        all_data: list = asyncio.run(descargar())
+    except httpx.HTTPError as e:
+        logger.error(f"Error en la solicitud: {e}")
+        return pd.DataFrame()
+    logger.info("No hay más datos para descargar. Fin del scraping.")
     df: pd.DataFrame = pd.DataFrame(all_data)
     logger.info(f"Datos obtenidos: {len(df)} registros.")
     logger.info("Finalizando scraper de costo reserva.")
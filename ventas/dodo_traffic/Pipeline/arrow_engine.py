@@ -0,0 +1,212 @@
+import datetime, logging
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from Pipeline.schema import Schema
+from Pipeline.dates import DateParser
+
+logger = logging.getLogger(__name__)
+
+
+class ArrowData:
+    """Motor ``engine="arrow"`` de ``ProcessData.process_data``.
+
+    Hace los mismos pasos que el camino de pandas (renombrar, limpiar strings,
+    fechas, redondeo, tipos de ``Schema`` y duplicados de ``reserva``) con
+    ``pyarrow.compute`` y devuelve un ``pa.Table``. El loader lo recibe igual
+    que un DataFrame: ``Schema.to_records`` acepta las dos cosas.
+    """
+
+    @staticmethod
+    def map_unique(arr: pa.ChunkedArray, fn) -> pa.Array:
+        """Igual que ``ProcessData.map_unique``: ``fn`` una vez por valor distinto."""
+        encoded = pc.dictionary_encode(arr).combine_chunks()
+        valores = [fn(v) for v in encoded.dictionary.to_pylist()] + [fn(None)]
+        indices = pc.fill_null(encoded.indices, len(valores) - 1)
+        return pc.take(pa.array(valores, type=pa.string()), indices)
+
+    @staticmethod
+    def clean_str(arr: pa.ChunkedArray) -> pa.ChunkedArray:
+        limpios = pc.utf8_upper(pc.utf8_trim_whitespace(arr))
+        return pc.if_else(pc.equal(pc.utf8_length(limpios), 0), None, limpios)
+
+    @staticmethod
+    def parse_dates(arr: pa.ChunkedArray) -> pa.ChunkedArray:
+        """Fechas con ``DateParser.TRAFFIC_FORMATS``. Arrow no soporta ``%f``: las
+        fracciones de segundo se descartan antes (igual que ``datetime64[s]``)."""
+        if arr.null_count == len(arr) and not pa.types.is_timestamp(arr.type):
+            # Columna sin ningún valor (p. ej. Fec_fin ausente en toda la
+            # página): pandas la arma como float64 de NaN
+            return pa.chunked_array([pa.nulls(len(arr), pa.timestamp("s"))])
+        if not pa.types.is_string(arr.type):
+            return pc.cast(arr, pa.timestamp("s"))
+        original = arr
+        arr = pc.replace_substring_regex(arr, pattern=r"\.\d+$", replacement="")
+        # Los formatos siguientes solo se prueban si quedaron valores sin parsear
+        fechas = None
+        for fmt in dict.fromkeys(
+            f.replace(".%f", "") for f in DateParser.TRAFFIC_FORMATS
+        ):
+            parseo = pc.strptime(arr, format=fmt, unit="s", error_is_null=True)
+            fechas = parseo if fechas is None else pc.coalesce(fechas, parseo)
+            if fechas.null_count == arr.null_count:
+                break
+        if fechas.null_count == arr.null_count:
+            return fechas
+        # Lo que no coincidió con ningún formato: misma inferencia que pandas
+        pendientes = pc.and_(pc.is_null(fechas), pc.is_valid(original))
+        inferidas = DateParser.parse_mixed(pc.filter(original, pendientes).to_pandas())
+        fechas = pc.replace_with_mask(
+            fechas.combine_chunks(),
+            pendientes.combine_chunks(),
+            pa.array(inferidas, pa.timestamp("s")),
+        )
+        return pa.chunked_array([fechas])
+
+    @staticmethod
+    def apply_schema(table: pa.Table) -> pa.Table:
+        """Tipos de ``Schema.COLUMNS`` en Arrow (mismas reglas que ``Schema.apply``)."""
+        for col, tipo in Schema.COLUMNS.items():
+            if col not in table.column_names:
+                continue
+            arr = table[col]
+            if tipo == "category":
+                if not pa.types.is_dictionary(arr.type):
+                    arr = pc.dictionary_encode(arr)
+            elif tipo == "Int16":
+                arr = pc.cast(pc.round(pc.cast(arr, pa.float64())), pa.int16())
+            elif tipo in ("date", "datetime"):
+                arr = ArrowData.parse_dates(arr)
+            elif tipo == "cents":
+                if arr.type != pa.int64():
+                    centavos = pc.round(pc.multiply(pc.cast(arr, pa.float64()), 100.0))
+                    arr = pc.cast(centavos, pa.int64())
+            table = table.set_column(table.column_names.index(col), col, arr)
+        return table
+
+    @staticmethod
+    def clean_chunk(
+        table: pa.Table,
+        drop_col: str,
+        rename_map: dict,
+        date_cols: list[str],
+        round_cols: list[str],
+    ) -> pa.Table:
+        # --- Eliminar columna innecesaria y renombrar ---
+        if drop_col in table.column_names:
+            table = table.drop_columns([drop_col])
+        table = table.rename_columns([rename_map.get(c, c) for c in table.column_names])
+
+        # --- Limpiar strings ---
+        for i, campo in enumerate(table.schema):
+            if pa.types.is_string(campo.type) or pa.types.is_large_string(campo.type):
+                table = table.set_column(
+                    i, campo.name, ArrowData.clean_str(table[campo.name])
+                )
+        if "vendedor" in table.column_names:
+            from Pipeline.functions import ProcessData
+
+            vendedor = table["vendedor"]
+            if pa.types.is_null(vendedor.type):
+                vendedor = pc.cast(vendedor, pa.string())
+            table = table.set_column(
+                table.column_names.index("vendedor"),
+                "vendedor",
+                ArrowData.map_unique(vendedor, ProcessData.quitar_acentos),
+            )
+
+        # --- Fechas ---
+        for col in date_cols:
+            if col in table.column_names:
+                fechas = ArrowData.parse_dates(table[col])
+                fallidos = fechas.null_count - table[col].null_count
+                if fallidos:
+                    logger.warning(
+                        f"⚠️ {fallidos} fechas sin formato conocido en '{col}' (quedan vacías)"
+                    )
+                table = table.set_column(table.column_names.index(col), col, fechas)
+
+        # --- Redondear numéricos ---
+        for col in round_cols:
+            if col in table.column_names:
+                table = table.set_column(
+                    table.column_names.index(col),
+                    col,
+                    pc.round(pc.cast(table[col], pa.float64()), 2),
+                )
+
+        return ArrowData.apply_schema(table)
+
+    @staticmethod
+    def finalize(table: pa.Table, output_path: str | None = None) -> pa.Table:
+        """Primera fila de cada ``reserva``; las nulas y duplicadas se descartan."""
+        table = table.append_column("__fila", pa.array(range(table.num_rows)))
+        primeras = (
+            table.filter(pc.is_valid(table["reserva"]))
+            .group_by("reserva", use_threads=False)
+            .aggregate([("__fila", "min")])["__fila_min"]
+        )
+        mantener = pc.is_in(table["__fila"], value_set=primeras.combine_chunks())
+
+        if output_path:
+            removed_rows = table.filter(pc.invert(mantener)).drop_columns(["__fila"])
+            if removed_rows.num_rows:
+                pd.DataFrame(ArrowData.to_records(removed_rows)).to_excel(
+                    output_path, index=False
+                )
+
+        table = table.filter(mantener).drop_columns(["__fila"])
+
+        # Mismo hash que el camino de pandas, columna por columna: no se arma
+        # el DataFrame entero
+        from Pipeline.functions import ProcessData
+
+        hashes = ProcessData.combine_hashes(
+            (ProcessData.column_hash(table[c].to_pandas()) for c in table.column_names),
+            table.num_columns,
+        )
+        return table.append_column("row_hash", pa.array(hashes.view("int64")))
+
+    @staticmethod
+    def process_data(
+        df: pd.DataFrame | pa.Table,
+        drop_col: str,
+        rename_map: dict,
+        date_cols: list[str],
+        round_cols: list[str],
+        output_path: str | None = None,
+    ) -> pa.Table:
+        table = (
+            df
+            if isinstance(df, pa.Table)
+            else pa.Table.from_pandas(df, preserve_index=False)
+        )
+        table = ArrowData.clean_chunk(
+            table, drop_col, rename_map, date_cols, round_cols
+        )
+        return ArrowData.finalize(table, output_path)
+
+    @staticmethod
+    def only_changed(
+        table: pa.Table, marca: datetime.datetime, col: str = "ultima_modif"
+    ) -> pa.Table:
+        desde = pa.scalar(pd.Timestamp(marca).to_pydatetime(), pa.timestamp("s"))
+        return table.filter(pc.greater_equal(ArrowData.parse_dates(table[col]), desde))
+
+    @staticmethod
+    def to_records(table: pa.Table) -> list[dict]:
+        """Filas con valores de Python, iguales a ``Schema.to_records`` de pandas."""
+        columnas = {}
+        for col in table.column_names:
+            arr = table[col]
+            tipo = Schema.COLUMNS.get(col)
+            if pa.types.is_dictionary(arr.type):
+                arr = pc.cast(arr, arr.type.value_type)
+            if tipo == "date" and pa.types.is_timestamp(arr.type):
+                arr = pc.cast(arr, pa.date32())
+            elif tipo == "cents" and pa.types.is_integer(arr.type):
+                arr = pc.round(pc.divide(pc.cast(arr, pa.float64()), 100.0), 2)
+            columnas[col] = arr.to_pylist()
+        nombres = list(columnas)
+        return [dict(zip(nombres, fila)) for fila in zip(*columnas.values())]
@@ -0,0 +1,84 @@
+import logging
+import pandas as pd
+
+
+class DateParser:
+    """Parseo de fechas con los formatos que devuelven Traffic y Odoo.
+
+    En lugar de dejar que pandas adivine el formato valor por valor, se prueba
+    cada formato conocido en orden (solo sobre lo que quedó sin parsear), con el
+    cache de valores repetidos de ``pd.to_datetime``. Lo que no coincide con
+    ningún formato se intenta al final con la inferencia de pandas
+    (``parse_mixed``). El resultado queda en
+    ``datetime64[s]``; la conversión a ``date`` recién se hace en el loader
+    (``Schema.to_db``).
+    """
+
+    # Serenity serializa DateTime como ISO 8601, a veces con milisegundos
+    TRAFFIC_FORMATS: list = ["%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f", "%Y-%m-%d"]
+    # write_date de Odoo, en UTC
+    ODDO_FORMATS: list = ["%Y-%m-%d %H:%M:%S"]
+
+    @staticmethod
+    def parse_mixed(serie: pd.Series) -> pd.Series:
+        """Valores fuera de los formatos conocidos: pandas infiere el formato de
+        cada valor distinto (``format="mixed"``). Con zona horaria se conserva
+        la hora tal como viene, sin pasarla a UTC."""
+
+        def a_fecha(valor):
+            fecha = pd.to_datetime(valor, format="mixed", errors="coerce")
+            if fecha is pd.NaT or fecha.tzinfo is None:
+                return fecha
+            return fecha.tz_localize(None)
+
+        mapa = {valor: a_fecha(valor) for valor in serie.unique()}
+        return pd.to_datetime(serie.map(mapa)).astype("datetime64[s]")
+
+    @staticmethod
+    def parse(serie: pd.Series, formats: list[str]) -> tuple[pd.Series, int]:
+        """Devuelve la serie en ``datetime64[s]`` y cuántos valores no nulos no
+        se pudieron leer ni con los formatos ni con ``parse_mixed`` (quedan
+        en NaT)."""
+        if serie.dtype.kind == "M":
+            return serie.astype("datetime64[s]"), 0
+
+        # cache=True: pandas parsea una sola vez cada valor repetido
+        primero, *resto = formats
+        resultado = pd.to_datetime(
+            serie, format=primero, errors="coerce", cache=True
+        ).astype("datetime64[s]")
+        pendientes = (resultado.isna() & serie.notna()).to_numpy()
+        for fmt in resto:
+            if not pendientes.any():
+                break
+            parseo = pd.to_datetime(
+                serie[pendientes], format=fmt, errors="coerce", cache=True
+            )
+            resultado[pendientes] = parseo.astype("datetime64[s]")
+            pendientes[pendientes] = parseo.isna().to_numpy()
+        if pendientes.any():
+            inferidas = DateParser.parse_mixed(serie[pendientes])
+            resultado[pendientes] = inferidas
+            pendientes[pendientes] = inferidas.isna().to_numpy()
+        fallidos = int(pendientes.sum())
+        return resultado, fallidos
+
+    @staticmethod
+    def parse_columns(
+        df: pd.DataFrame,
+        columns: list[str],
+        formats: list[str],
+        logger: logging.Logger | None = None,
+    ) -> dict:
+        """Parsea ``columns`` en el lugar y avisa por columna los valores que no
+        se pudieron leer. Devuelve ``{columna: fallidos}``."""
+        logger = logger or logging.getLogger(__name__)
+        fallidos: dict = {}
+        for col in columns:
+            if col in df.columns:
+                df[col], fallidos[col] = DateParser.parse(df[col], formats)
+                if fallidos[col]:
+                    logger.warning(
+                        f"⚠️ {fallidos[col]} fechas sin formato conocido en '{col}' (quedan vacías)"
+                    )
+        return fallidos
@@ -1,22 +1,195 @@
 from Pipeline.functions import ProcessData, setup_logging, Loader
+from Pipeline.loggins_system import ProcessTracker
 from Pipeline.scraper import Scraper
+from Pipeline.incremental import Watermark
+from Pipeline.frames import Frames
+from Pipeline.model import Reserva, Presupuesto, Oddo
+from Pipeline.vendors import VendorResolver
+from Pipeline.raw_cache import RawCache
 from Pipeline.utils import Paths
-import datetime
+import argparse, datetime
 from sqlmodel import Session
 
 
-def main_etl(desde: datetime.date, hasta: datetime.date) -> None:
+def main_etl(
+    desde: datetime.date,
+    hasta: datetime.date,
+    incremental: bool = False,
+    replay: bool = False,
+    record: bool = Paths.RAW_CACHE,
+    stream: bool = Paths.TRAFFIC_STREAM,
+    engine: str = Paths.PROCESS_ENGINE,
+    strategy: str = Paths.LOAD_STRATEGY,
+    parallel: bool = Paths.LOAD_PARALLEL,
+) -> None:
+    """ETL completo. Con ``incremental=True`` solo se descargan y cargan las
+    reservas, presupuestos y leads de Oddo modificados desde la última corrida
+    (del mismo rango ``desde``/``hasta`` para Traffic, ver ``Watermark.key``).
+
+    ``record`` graba las respuestas crudas en ``Paths.RAW_CACHE_DIR``;
+    ``replay`` corre el ETL desde ese cache sin acceder a Traffic ni a Oddo.
+    ``stream`` limpia reservas y presupuestos página por página durante la descarga.
+    ``engine`` elige el motor de ``process_data`` ("pandas" o "arrow") cuando
+    no hay streaming. ``strategy`` elige cómo se cargan las tres tablas
+    ("orm", "bulk" o "staging", ver ``Loader.upsert``); con ``parallel`` se
+    cargan a la vez, cada una en su conexión (``Loader.upsert_parallel``).
+    """
     logger = setup_logging()
 
-    reservas, presupuestos, oddo = Scraper.scrape_all(desde, hasta, logger)
+    cache = RawCache(Paths.RAW_CACHE_DIR, replay=replay) if record or replay else None
+
+    claves = {
+        "reservas": Watermark.key("reservas", desde, hasta),
+        "presupuestos": Watermark.key("presupuestos", desde, hasta),
+        "oddo": Watermark.key("oddo"),  # Odoo no se pide por rango
+    }
+    marcas: dict = {}
+    if incremental:
+        with Session(Paths.engine()) as session:
+            marcas = {
+                fuente: marca
+                for fuente, clave in claves.items()
+                if (marca := Watermark.get(session, clave)) is not None
+            }
+        logger.info(f"Modo incremental. Marcas: {marcas}")
+
+    reservas, presupuestos, oddo = Scraper.scrape_all(
+        desde, hasta, logger, modificado_desde=marcas, cache=cache, stream=stream
+    )
+
+    # Una fuente que falló en la descarga llega como None y no se carga
+    reservas_f = presupuestos_f = oddo_f = None
+    if reservas is not None:
+        # En modo stream ya vienen procesados desde el scraper
+        reservas_f = (
+            reservas if stream else ProcessData.process_rva(reservas, engine=engine)
+        )
+    if presupuestos is not None:
+        presupuestos_f = (
+            presupuestos
+            if stream
+            else ProcessData.process_pres(presupuestos, engine=engine)
+        )
+    if oddo is not None:
+        oddo_f = ProcessData.process_oddo(oddo)
+
+    if incremental:
+        if reservas_f is not None:
+            reservas_f = Watermark.only_changed(reservas_f, marcas.get("reservas"))
+        if presupuestos_f is not None:
+            presupuestos_f = Watermark.only_changed(
+                presupuestos_f, marcas.get("presupuestos")
+            )
+
+    vendors = VendorResolver(Paths.VENDOR_CACHE, register=Paths.VENDOR_AUTOREGISTER)
+    cargas = [
+        (df, model)
+        for df, model in (
+            (reservas_f, Reserva),
+            (presupuestos_f, Presupuesto),
+            (oddo_f, Oddo),
+        )
+        if df is not None
+    ]
+    trackers = [
+        ProcessTracker(model.__tablename__, sample_every=Paths.TRACKER_SAMPLE_EVERY)
+        for _, model in cargas
+    ]
+    opciones = dict(
+        strategy=strategy,
+        batch_size=Paths.LOAD_BATCH_SIZE,
+        quarantine_dir=Paths.QUARANTINE_DIR,
+        vendors=vendors,
+    )
+    # Filas guardadas de cada tabla (sin las de cuarentena ni sin vendedor)
+    if parallel:
+        guardadas = Loader.upsert_parallel(
+            cargas, Paths.engine(), logger, trackers, **opciones
+        )
+    else:
+        with Session(Paths.engine()) as session:
+            guardadas = [
+                Loader.upsert(df, model, session, logger, tracker, **opciones)
+                for (df, model), tracker in zip(cargas, trackers)
+            ]
+
+    if incremental:
+        # La marca sale solo de lo que quedó guardado: fuente y columna de
+        # fecha de modificación de cada tabla
+        marca_de = {
+            Reserva: ("reservas", "ultima_modif"),
+            Presupuesto: ("presupuestos", "ultima_modif"),
+            Oddo: ("oddo", "write_date"),
+        }
+        with Session(Paths.engine()) as session:
+            for (df, model), escritas in zip(cargas, guardadas):
+                fuente, col = marca_de[model]
+                if col not in Frames.columns(df):
+                    continue
+                Watermark.update(
+                    session,
+                    claves[fuente],
+                    Frames.column_to_pandas(escritas, col),
+                    logger,
+                    pendientes=Watermark.pending(
+                        df, escritas, model.__natural_key__, col
+                    ),
+                )
+            session.commit()
 
-    reservas_f = ProcessData.process_rva(reservas)
-    presupuestos_f = ProcessData.process_pres(presupuestos)
-    oddo_f = ProcessData.process_oddo(oddo)
+    if Paths.METRICS_DIR and trackers:
+        ProcessTracker.export_metrics(trackers, Paths.METRICS_DIR)
+        logger.info(f"📈 Métricas de la carga en {Paths.METRICS_DIR}")
 
-    with Session(Paths.ENGINE) as session:
-        Loader.upsert_reservas(reservas_f, session, logger)
-        Loader.upsert_presupuestos(presupuestos_f, session, logger)
-        Loader.upsert_oddo(oddo_f, session, logger)
+    fallidas = [
+        nombre
+        for nombre, df in (
+            ("reservas", reservas),
+            ("presupuestos", presupuestos),
+            ("oddo", oddo),
+        )
+        if df is None
+    ]
+    if fallidas:
+        logger.error(f"❌ Fuentes sin cargar por errores: {', '.join(fallidas)}")
 
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ETL Traffic + Oddo")
+    parser.add_argument("--desde", type=datetime.date.fromisoformat, required=True)
+    parser.add_argument("--hasta", type=datetime.date.fromisoformat, required=True)
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument(
+        "--stream", action="store_true", help="Procesar cada página al recibirla"
+    )
+    parser.add_argument(
+        "--record", action="store_true", help="Grabar respuestas crudas en el cache"
+    )
+    parser.add_argument(
+        "--replay", action="store_true", help="Usar el cache, sin acceso a la red"
+    )
+    parser.add_argument(
+        "--engine", choices=["pandas", "arrow"], default=Paths.PROCESS_ENGINE
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=["orm", "bulk", "staging"],
+        default=Paths.LOAD_STRATEGY,
+    )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Cargar las tablas a la vez, en conexiones separadas",
+    )
+    args = parser.parse_args()
+    main_etl(
+        args.desde,
+        args.hasta,
+        incremental=args.incremental,
+        replay=args.replay,
+        record=args.record or Paths.RAW_CACHE,
+        stream=args.stream or Paths.TRAFFIC_STREAM,
+        engine=args.engine,
+        strategy=args.strategy,
+        parallel=args.parallel or Paths.LOAD_PARALLEL,
+    )
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+
+class Frames:
+    """Lo que el loader, los vendedores y las marcas de agua necesitan de un
+    lote, sea un ``pd.DataFrame`` (motor "pandas") o un ``pa.Table`` (motor
+    "arrow", ver ``ArrowData``). pyarrow solo se importa si llega un
+    ``pa.Table``."""
+
+    @staticmethod
+    def is_arrow(df) -> bool:
+        return not isinstance(df, pd.DataFrame)
+
+    @staticmethod
+    def columns(df) -> list[str]:
+        return df.column_names if Frames.is_arrow(df) else list(df.columns)
+
+    @staticmethod
+    def num_rows(df) -> int:
+        return df.num_rows if Frames.is_arrow(df) else len(df)
+
+    @staticmethod
+    def column_to_pandas(df, name: str) -> pd.Series:
+        return df[name].to_pandas() if Frames.is_arrow(df) else df[name]
+
+    @staticmethod
+    def to_pandas(df, columns: list[str]) -> pd.DataFrame:
+        """Solo ``columns``, como ``DataFrame``."""
+        return df.select(columns).to_pandas() if Frames.is_arrow(df) else df[columns]
+
+    @staticmethod
+    def filter(df, mascara: np.ndarray):
+        """Filas donde ``mascara`` (booleana, una por fila) es verdadera."""
+        if not Frames.is_arrow(df):
+            return df[mascara]
+        import pyarrow as pa
+
+        return df.filter(pa.array(mascara))
+
+    @staticmethod
+    def with_column(df, name: str, valores: np.ndarray):
+        """``df`` con la columna ``name`` agregada."""
+        if not Frames.is_arrow(df):
+            return df.assign(**{name: valores})
+        import pyarrow as pa
+
+        return df.append_column(name, pa.array(valores))
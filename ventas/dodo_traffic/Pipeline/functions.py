@@ -1,27 +1,91 @@
 import pandas as pd
 import numpy as np
-from sqlmodel import select, Session
+from sqlmodel import select, update, Session
 from Pipeline.model import Vendedor, Presupuesto, Reserva, Oddo
+from Pipeline.schema import Schema
+from Pipeline.dates import DateParser
+from Pipeline.vendors import VendorResolver
+from Pipeline.frames import Frames
 
 # from Pipeline.model import Vendedor, Presupuesto, Reserva, Oddo
+from sqlalchemy import Column, MetaData, Table, text
 from sqlalchemy.exc import SQLAlchemyError
-import unicodedata
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import os, tempfile, unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from Pipeline.loggins_system import *
 
 
 class ProcessData:
+    @staticmethod
+    def map_unique(serie: pd.Series, fn) -> pd.Series:
+        """Aplica ``fn`` una sola vez por valor distinto y lo expande a toda la
+        columna (factorize → fn → take). Los nulos se pasan a ``fn`` como None."""
+        codes, uniques = pd.factorize(serie)
+        valores = np.empty(len(uniques) + 1, dtype=object)
+        valores[:-1] = [fn(u) for u in uniques]
+        valores[-1] = fn(None)  # código -1 = nulo
+        return pd.Series(valores[codes], index=serie.index, dtype=object)
+
     @staticmethod
     def clean_str(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
         for col in columns:
             if col in df.columns:
-                # Primero hacer strip y upper solo en valores no nulos
-                df[col] = df[col].apply(
-                    lambda x: (
-                        x.strip().upper() if pd.notna(x) and str(x).strip() else None
-                    )
+                # strip + upper vectorizado sobre los valores distintos; vacíos → None
+                codes, uniques = pd.factorize(df[col])
+                uniques = pd.Series(uniques, dtype=object)
+                limpios = uniques.str.strip().str.upper()
+                limpios = limpios.where(limpios.str.len() > 0, None)
+                # Lo que no es string se deja como estaba
+                limpios = limpios.where(
+                    uniques.map(lambda x: isinstance(x, str)), uniques
                 )
+                valores = np.append(limpios.to_numpy(dtype=object), None)
+                df[col] = pd.Series(valores[codes], index=df.index, dtype=object)
         return df
 
+    @staticmethod
+    def row_hash(df: pd.DataFrame, exclude: tuple = ("row_hash",)) -> pd.Series:
+        """Hash de 64 bits del contenido de cada fila (el mismo valor que
+        ``hash_pandas_object`` sobre las columnas normalizadas).
+
+        Los valores se normalizan antes (fechas a segundos, números a float,
+        el resto a objetos) para que el hash no dependa del dtype: sale igual
+        con el motor de pandas y con el de arrow."""
+        columnas = [c for c in df.columns if c not in exclude]
+        hashes = ProcessData.combine_hashes(
+            (ProcessData.column_hash(df[c]) for c in columnas), len(columnas)
+        )
+        # BIGINT con signo
+        return pd.Series(hashes.view("int64"), index=df.index)
+
+    @staticmethod
+    def column_hash(s: pd.Series) -> np.ndarray:
+        """Hash ``uint64`` por fila de una columna ya normalizada."""
+        if s.dtype.kind == "M":
+            valores = s.astype("datetime64[s]").to_numpy().view("int64")
+        elif pd.api.types.is_numeric_dtype(s.dtype) and s.dtype.kind != "O":
+            valores = pd.to_numeric(s).astype("float64").to_numpy()
+        else:
+            valores = s.astype(object).where(s.notna(), None).to_numpy()
+        return pd.util.hash_array(valores)
+
+    @staticmethod
+    def combine_hashes(hashes, columnas: int) -> np.ndarray:
+        """Combina los hashes de cada columna igual que ``hash_pandas_object``
+        con un DataFrame. ``hashes`` puede ser un generador: así se tiene en
+        memoria una sola columna por vez."""
+        mult = np.uint64(1000003)
+        out = None
+        for i, h in enumerate(hashes):
+            if out is None:
+                out = np.zeros_like(h) + np.uint64(0x345678)
+            out ^= h
+            out *= mult
+            mult += np.uint64(82520 + 2 * (columnas - i))
+        return out + np.uint64(97531)
+
     @staticmethod
     def clean_nan(value):
         return None if pd.isna(value) else value
@@ -36,16 +100,66 @@ class ProcessData:
         texto = texto.replace("ñ", "n").replace("Ñ", "N")
         return texto
 
+    # Configuración de cada fuente de Traffic para process_data / clean_chunk
+    PRES_CONFIG: dict = dict(
+        drop_col="Idpresupu",
+        rename_map={
+            "Rva": "reserva",
+            "Tiporva": "tipo_reserva",
+            "Fec_mod": "ultima_modif",
+            "Fec_rva": "fecha_reserva",
+            "Fec_sal": "fecha_salida",
+            "Nombreagencia_cod_agcia": "cliente",
+            "Observ": "nombre_grupo",
+            "Estado": "estado",
+            "Can_adu": "can_adu",
+            "Can_chd": "can_chd",
+            "Moneda": "moneda",
+            "Nombrevendedor_cod_vdor": "vendedor",
+            "Total": "total",
+            "costoConIva": "costo_final",
+            "GananciaTotal": "ganancia",
+            "Productos": "productos",
+        },
+        date_cols=["ultima_modif", "fecha_reserva", "fecha_salida"],
+        round_cols=["total", "costo_final", "ganancia", "productos"],
+    )
+
+    RVA_CONFIG: dict = dict(
+        drop_col="Idreserva",
+        rename_map={
+            "Rva": "reserva",
+            "Tiporva": "tipo_reserva",
+            "Fec_mod": "ultima_modif",
+            "Fec_rva": "fecha_reserva",
+            "Fec_sal": "fecha_salida",
+            "Fec_fin": "fecha_fin",
+            "Nombreagencia_cod_agcia": "cliente",
+            "Nombregrupo": "nombre_grupo",
+            "Estado": "estado",
+            "Can_adu": "can_adu",
+            "Can_chd": "can_chd",
+            "Moneda": "moneda",
+            "Nombrevendedor_cod_vdor": "vendedor",
+            "Total": "total",
+            "gananciaTotal": "ganancia",
+            "Tipocont": "eje_reservas_para",
+            "Descripparame_productos": "descrip_productos",
+        },
+        date_cols=["ultima_modif", "fecha_reserva", "fecha_salida", "fecha_fin"],
+        round_cols=["total", "ganancia"],
+    )
+
     @staticmethod
-    def process_data(
+    def clean_chunk(
         df: pd.DataFrame,
         drop_col: str,
         rename_map: dict,
         date_cols: list[str],
         round_cols: list[str],
-        output_path: str | None = None,
     ) -> pd.DataFrame:
-        """Procesa un DataFrame de presupuestos o reservas."""
+        """Limpieza fila a fila: sirve tanto para el DataFrame completo como para
+        cada página por separado (modo streaming)."""
 
         # --- Eliminar columna innecesaria ---
         df = df.drop(columns=[drop_col], errors="ignore")
@@ -56,23 +170,24 @@ class ProcessData:
         # --- Limpiar strings ---
         df = ProcessData.clean_str(df, df.select_dtypes(include="object").columns)
         if "vendedor" in df.columns:
-            df["vendedor"] = df["vendedor"].apply(ProcessData.quitar_acentos)
-        # --- Fechas ---
-        for col in date_cols:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], errors="coerce").dt.date
-
-        # --- Niños ---
-        if "can_chd" in df.columns:
-            df["can_chd"] = (
-                pd.to_numeric(df["can_chd"], errors="coerce").round(0).astype("Int64")
+            df["vendedor"] = ProcessData.map_unique(
+                df["vendedor"], ProcessData.quitar_acentos
             )
+        # --- Fechas ---
+        DateParser.parse_columns(df, date_cols, DateParser.TRAFFIC_FORMATS)
 
         # --- Redondear numéricos ---
         for col in round_cols:
             if col in df.columns:
                 df[col] = pd.to_numeric(df[col], errors="coerce").round(2)
 
+        # --- Tipos finales (categorías, enteros chicos, fechas, centavos) ---
+        return Schema.apply(df)
+
+    @staticmethod
+    def finalize(df: pd.DataFrame, output_path: str | None = None) -> pd.DataFrame:
+        """Pasos que necesitan el conjunto completo: duplicados y nulos."""
+
         # --- Duplicados y nulos ---
         duplicated_rows = df[df.duplicated(subset=["reserva"], keep="first")].copy()
         df.drop_duplicates(subset=["reserva"], keep="first", inplace=True)
@@ -83,67 +198,59 @@ class ProcessData:
         # --- Guardar eliminadas ---
         removed_rows = pd.concat([duplicated_rows, missing_file_rows]).drop_duplicates()
         if not removed_rows.empty and output_path:
-            removed_rows.to_excel(output_path, index=False)
+            Schema.to_db(removed_rows).to_excel(output_path, index=False)
 
-        df = df.replace({np.nan: None})
+        # Al unir páginas (streaming/ventanas) las categorías pueden volver a object
+        df = Schema.apply(df)
+        df["row_hash"] = ProcessData.row_hash(df)
         return df
 
+    @staticmethod
+    def process_data(
+        df: pd.DataFrame,
+        drop_col: str,
+        rename_map: dict,
+        date_cols: list[str],
+        round_cols: list[str],
+        output_path: str | None = None,
+        engine: str = "pandas",
+    ) -> pd.DataFrame:
+        """Procesa un DataFrame de presupuestos o reservas. Con ``engine="arrow"``
+        se procesa con pyarrow y devuelve un ``pa.Table`` (ver ``ArrowData``)."""
+        if engine == "arrow":
+            from Pipeline.arrow_engine import ArrowData
+
+            return ArrowData.process_data(
+                df, drop_col, rename_map, date_cols, round_cols, output_path
+            )
+        if engine != "pandas":
+            raise ValueError(f"Motor desconocido: {engine}")
+        df = ProcessData.clean_chunk(df, drop_col, rename_map, date_cols, round_cols)
+        return ProcessData.finalize(df, output_path)
+
     # --- Métodos convenientes que usan la genérica ---
     @staticmethod
-    def process_pres(df: pd.DataFrame, output_path: str | None = None) -> pd.DataFrame:
+    def clean_pres(df: pd.DataFrame) -> pd.DataFrame:
+        return ProcessData.clean_chunk(df, **ProcessData.PRES_CONFIG)
+
+    @staticmethod
+    def clean_rva(df: pd.DataFrame) -> pd.DataFrame:
+        return ProcessData.clean_chunk(df, **ProcessData.RVA_CONFIG)
+
+    @staticmethod
+    def process_pres(
+        df: pd.DataFrame, output_path: str | None = None, engine: str = "pandas"
+    ) -> pd.DataFrame:
         return ProcessData.process_data(
-            df=df,
-            drop_col="Idpresupu",
-            rename_map={
-                "Rva": "reserva",
-                "Tiporva": "tipo_reserva",
-                "Fec_mod": "ultima_modif",
-                "Fec_rva": "fecha_reserva",
-                "Fec_sal": "fecha_salida",
-                "Nombreagencia_cod_agcia": "cliente",
-                "Observ": "nombre_grupo",
-                "Estado": "estado",
-                "Can_adu": "can_adu",
-                "Can_chd": "can_chd",
-                "Moneda": "moneda",
-                "Nombrevendedor_cod_vdor": "vendedor",
-                "Total": "total",
-                "costoConIva": "costo_final",
-                "GananciaTotal": "ganancia",
-                "Productos": "productos",
-            },
-            date_cols=["ultima_modif", "fecha_reserva", "fecha_salida"],
-            round_cols=["total", "costo_final", "ganancia", "productos"],
-            output_path=output_path,
+            df=df, **ProcessData.PRES_CONFIG, output_path=output_path, engine=engine
         )
 
     @staticmethod
-    def process_rva(df: pd.DataFrame, output_path: str | None = None) -> pd.DataFrame:
+    def process_rva(
+        df: pd.DataFrame, output_path: str | None = None, engine: str = "pandas"
+    ) -> pd.DataFrame:
         return ProcessData.process_data(
-            df=df,
-            drop_col="Idreserva",
-            rename_map={
-                "Rva": "reserva",
-                "Tiporva": "tipo_reserva",
-                "Fec_mod": "ultima_modif",
-                "Fec_rva": "fecha_reserva",
-                "Fec_sal": "fecha_salida",
-                "Fec_fin": "fecha_fin",
-                "Nombreagencia_cod_agcia": "cliente",
-                "Nombregrupo": "nombre_grupo",
-                "Estado": "estado",
-                "Can_adu": "can_adu",
-                "Can_chd": "can_chd",
-                "Moneda": "moneda",
-                "Nombrevendedor_cod_vdor": "vendedor",
-                "Total": "total",
-                "gananciaTotal": "ganancia",
-                "Tipocont": "eje_reservas_para",
-                "Descripparame_productos": "descrip_productos",
-            },
-            date_cols=["ultima_modif", "fecha_reserva", "fecha_salida", "fecha_fin"],
-            round_cols=["total", "ganancia"],
-            output_path=output_path,
+            df=df, **ProcessData.RVA_CONFIG, output_path=output_path, engine=engine
         )
 
     @staticmethod
@@ -174,9 +281,18 @@ class ProcessData:
         }
         df = df.rename(columns=new_cols)
         df = ProcessData.clean_str(df, df.select_dtypes(include="object").columns)
-        df["vendedor"] = df["vendedor"].apply(ProcessData.quitar_acentos)
-        df["ganancia_esperada"] = df["ganancia_esperada"].apply(limpiar_ganancia)
-        df = df.replace({np.nan: None})
+        df["vendedor"] = ProcessData.map_unique(
+            df["vendedor"], ProcessData.quitar_acentos
+        )
+        df["ganancia_esperada"] = ProcessData.map_unique(
+            df["ganancia_esperada"], limpiar_ganancia
+        )
+        DateParser.parse_columns(df, ["write_date"], DateParser.ODDO_FORMATS)
+        df = Schema.apply(df)
+        # nombre_grupo es la clave natural de oddos: queda el último lead
+        df = df.drop_duplicates(subset=["nombre_grupo"], keep="last")
+        # write_date no se guarda: no cuenta como cambio
+        df["row_hash"] = ProcessData.row_hash(df, exclude=("row_hash", "write_date"))
         return df
 
 
@@ -188,306 +304,583 @@ class Loader:
         session.flush()
 
     @staticmethod
-    def upsert_reservas(
-        press_f: pd.DataFrame,
-        session: Session,
-        logger: logging.Logger,
-        tracker_reservas: ProcessTracker = ProcessTracker(),
-    ):
-        tracker_reservas.increment_processed()
-
-        logger.info("Iniciando carga de reservas...\n")
-        # Normalizamos: quitamos espacios y ponemos todo en mayúscula
-        vendedores: dict = {
-            v.nombre_completo.strip().upper(): v
-            for v in session.exec(select(Vendedor)).all()
-        }
+    def skip_unchanged(session: Session, model, key: str, df, logger: logging.Logger):
+        """Cruza ``row_hash`` del lote con los guardados y deja solo las filas
+        nuevas o cambiadas. Las filas guardadas sin hash cuentan como cambiadas."""
+        lote = Frames.to_pandas(df, [key, "row_hash"]).astype(object)
+
+        guardados = Loader.existing_rows(session, model, key, lote[key], ["row_hash"])
+        guardados = pd.DataFrame(
+            [(k, f.row_hash) for k, f in guardados.items()],
+            columns=[key, "row_hash_db"],
+            dtype=object,
+        )
+        cruce = lote.merge(guardados, on=key, how="left")
+        sin_cambios = (cruce["row_hash"] == cruce["row_hash_db"]).to_numpy()
+
+        nuevos = int(cruce["row_hash_db"].isna().sum())
+        logger.info(
+            f"  🔎 {model.__tablename__}: {nuevos} nuevas, "
+            f"{len(cruce) - nuevos - int(sin_cambios.sum())} cambiadas, "
+            f"{int(sin_cambios.sum())} sin cambios"
+        )
+        return Frames.filter(df, ~sin_cambios)
 
-        # 🔹 Cachear reservas existentes (clave: código reserva)
-        reservas_existentes: dict = {
-            r.reserva: r for r in session.exec(select(Reserva)).all()
-        }
+    @staticmethod
+    def existing_rows(
+        session: Session,
+        model,
+        key: str,
+        claves,
+        columnas: list[str] | None = None,
+        chunk_size: int = 1000,
+    ) -> dict:
+        """Filas ya guardadas solo para las ``claves`` del lote, con ``IN (...)``
+        de a ``chunk_size``. Devuelve ``{clave: Row}`` con la PK, ``key`` y
+        ``columnas`` (por defecto todas): tuplas livianas, no objetos ORM."""
+        pk = model.__table__.primary_key.columns.keys()[0]
+        if columnas is None:
+            columnas = [c for c in model.__table__.columns.keys() if c != pk]
+        seleccion = [getattr(model, c) for c in dict.fromkeys([pk, key, *columnas])]
+        columna_key = getattr(model, key)
+
+        if hasattr(claves, "to_pylist"):  # columna de un pa.Table
+            claves = claves.to_pylist()
+        claves = list(dict.fromkeys(c for c in claves if c is not None and c == c))
+        existentes: dict = {}
+        for inicio in range(0, len(claves), chunk_size):
+            lote = claves[inicio : inicio + chunk_size]
+            for fila in session.exec(select(*seleccion).where(columna_key.in_(lote))):
+                existentes[getattr(fila, key)] = fila
+        return existentes
 
-        for index, row in press_f.iterrows():
+    @staticmethod
+    def write_batches(
+        session: Session,
+        items: list,
+        write,
+        on_ok,
+        key_of,
+        nombre: str,
+        logger: logging.Logger,
+        tracker: ProcessTracker,
+        batch_size: int = 1000,
+        quarantine_dir: str | None = None,
+        row_of=None,
+    ) -> list[dict]:
+        """Escribe ``items`` de a ``batch_size``, cada lote dentro de un SAVEPOINT
+        y con commit al terminarlo. Si un lote falla se parte a la mitad hasta
+        aislar las filas con error: esas quedan en cuarentena (tracker y, con
+        ``quarantine_dir``, un CSV) y el resto se guarda igual.
+
+        ``write(lote)`` hace la escritura, ``on_ok(lote)`` registra lo guardado
+        y ``key_of``/``row_of`` dan la clave y los datos de cada item."""
+        row_of = row_of or (lambda item: item)
+        cuarentena: list = []
+
+        def escribir(lote: list) -> None:
             try:
+                with session.begin_nested():
+                    write(lote)
+            except SQLAlchemyError as e:
+                if len(lote) > 1:
+                    mitad = len(lote) // 2
+                    escribir(lote[:mitad])
+                    escribir(lote[mitad:])
+                    return
+                clave = key_of(lote[0])
+                error = str(getattr(e, "orig", e))
+                logger.error(f"  ❌ Error SQL en {clave}: {error}")
+                tracker.add_error(clave, f"Error SQL: {error}")
+                cuarentena.append({**row_of(lote[0]), "error": error})
+                return
+            on_ok(lote)
+
+        for inicio in range(0, len(items), batch_size):
+            escribir(items[inicio : inicio + batch_size])
+            session.commit()
+            logger.info(
+                f"  📦 {nombre}: {min(inicio + batch_size, len(items))}/{len(items)} filas"
+            )
 
-                vendedor_nombre = row.get("vendedor")
-                vendedor_obj: Vendedor = vendedores.get(vendedor_nombre)
-
-                if not vendedor_obj:
-                    logger.warning(
-                        f"  ⚠️  Vendedor '{vendedor_nombre}' no encontrado, saltando..."
-                    )
-                    tracker_reservas.add_error(
-                        row.get("reserva"),
-                        f"Vendedor '{vendedor_nombre}' no encontrado",
-                    )
-                    continue
-
-                # Datos comunes
-                data = dict(
-                    reserva=ProcessData.clean_nan(row.get("reserva")),
-                    tipo_reserva=ProcessData.clean_nan(row.get("tipo_reserva")),
-                    ultima_modif=ProcessData.clean_nan(row.get("ultima_modif")),
-                    fecha_reserva=ProcessData.clean_nan(row.get("fecha_reserva")),
-                    fecha_salida=ProcessData.clean_nan(row.get("fecha_salida")),
-                    fecha_fin=ProcessData.clean_nan(row.get("fecha_fin")),
-                    cliente=ProcessData.clean_nan(row.get("cliente")),
-                    vendedor_id=vendedor_obj.vendedor_id,
-                    nombre_grupo=ProcessData.clean_nan(row.get("nombre_grupo")),
-                    estado=ProcessData.clean_nan(row.get("estado")),
-                    can_adu=ProcessData.clean_nan(row.get("can_adu")),
-                    can_chd=ProcessData.clean_nan(row.get("can_chd")),
-                    moneda=ProcessData.clean_nan(row.get("moneda")),
-                    total=ProcessData.clean_nan(row.get("total")),
-                    ganancia=ProcessData.clean_nan(row.get("ganancia")),
-                    eje_reservas_para=ProcessData.clean_nan(
-                        row.get("eje_reservas_para")
-                    ),
-                    descrip_productos=ProcessData.clean_nan(
-                        row.get("descrip_productos")
-                    ),
+        if cuarentena:
+            logger.warning(f"  ⚠️  {len(cuarentena)} filas en cuarentena ({nombre})")
+            if quarantine_dir:
+                os.makedirs(quarantine_dir, exist_ok=True)
+                ruta = os.path.join(
+                    quarantine_dir, f"{nombre}_{datetime.now():%Y%m%d_%H%M%S}.csv"
                 )
+                pd.DataFrame(cuarentena).to_csv(ruta, index=False)
+                logger.warning(f"  📄 Cuarentena guardada en {ruta}")
+        return cuarentena
 
-                rva_key = data["reserva"]
-
-                # 🔹 Si ya existe → actualizar
-                if rva_key in reservas_existentes:
-                    obj = reservas_existentes[rva_key]
-                    cambios = {}
-                    for k, v in data.items():
-                        actual = getattr(obj, k)
-                        if actual != v:
-                            cambios[k] = (actual, v)
-                            setattr(obj, k, v)
-
-                    if cambios:
-                        tracker_reservas.add_update(
-                            row.get("reserva"), list(cambios.keys())
-                        )
-                        logger.info(
-                            f"  🔄 Actualizado {rva_key}: {list(cambios.keys())}"
-                        )
-                # 🔹 Si no existe → crear nuevo
+    @staticmethod
+    def write_operations(
+        session: Session,
+        model,
+        operaciones: list[dict],
+        logger: logging.Logger,
+        tracker: ProcessTracker,
+        batch_size: int = 1000,
+        quarantine_dir: str | None = None,
+    ) -> list[dict]:
+        """Aplica las operaciones del camino ORM: ``update=None`` es un alta
+        (``data``), si no ``update`` es el ``UPDATE`` por clave primaria."""
+
+        def write(lote: list) -> None:
+            session.add_all(
+                [model(**op["data"]) for op in lote if op["update"] is None]
+            )
+            cambios = [op["update"] for op in lote if op["update"] is not None]
+            if cambios:
+                session.execute(update(model), cambios)
+
+        def on_ok(lote: list) -> None:
+            # El detalle por fila solo con nivel DEBUG; por defecto, uno por lote
+            detalle = logger.isEnabledFor(logging.DEBUG)
+            nuevos = 0
+            for op in lote:
+                if op["update"] is None:
+                    nuevos += 1
+                    tracker.add_new(op["clave"])
+                    if detalle:
+                        logger.debug(f"  📝 Creado nuevo: {op['clave']}")
                 else:
-                    session.add(Reserva(**data))
-                    logger.info(f"  📝 Creado nuevo: {rva_key}")
-                    tracker_reservas.add_new(row.get("reserva"))
-
-            except SQLAlchemyError as e:
-                logger.error(f"  ❌ Error SQL en {row.get('reserva')}: {e}")
-                tracker_reservas.add_error(row.get("reserva"), f"Error SQL: {e}")
-                session.rollback()
-            except Exception as e:
-                logger.error(f"  ❌ Error SQL en {row.get('reserva')}: {e}")
-                tracker_reservas.add_error(row.get("reserva"), row, f"Error SQL: {e}")
-                session.rollback()
-
-        # 🔹 Commit final
-        session.commit()
-
-        summary = tracker_reservas.get_summary()
+                    tracker.add_update(op["clave"], op["campos"])
+                    if detalle:
+                        logger.debug(f"  🔄 Actualizado {op['clave']}: {op['campos']}")
+            logger.info(f"  ✅ {nuevos} nuevos, {len(lote) - nuevos} actualizados")
+
+        return Loader.write_batches(
+            session,
+            operaciones,
+            write,
+            on_ok,
+            lambda op: op["clave"],
+            model.__tablename__,
+            logger,
+            tracker,
+            batch_size,
+            quarantine_dir,
+            lambda op: op["data"],
+        )
 
-        logger.info("Commit --Reservas-- final realizado.")
-        logger.info("📊 RESUMEN FINAL DEL PROCESO RESERVAS")
-        logger.info("=" * 60)
-        logger.info(f"⏰ Duración total: {summary['duracion']}")
-        logger.info(f"📁 Total procesadas: {summary['stats']['total_procesadas']}")
-        logger.info(f"✨ Nuevos registros: {summary['stats']['nuevos']}")
-        logger.info(f"📝 Registros actualizados: {summary['stats']['actualizados']}")
-        logger.info(f"❌ Errores: {summary['stats']['errores']}")
-        logger.info("=" * 60)
-        logger.info("✅ PROCESO COMPLETADO")
-        logger.info("=" * 60)
+    @staticmethod
+    def upsert_statement(session: Session, model, key: str):
+        """``INSERT ... ON DUPLICATE KEY UPDATE`` (MySQL) o ``INSERT ... ON
+        CONFLICT DO UPDATE`` (SQLite) sobre el índice único de ``key``."""
+        table = model.__table__
+        columnas = [
+            c.name for c in table.columns if not c.primary_key and c.name != key
+        ]
+        dialecto = session.get_bind().dialect.name
+        if dialecto == "mysql":
+            stmt = mysql_insert(table)
+            return stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in columnas})
+        if dialecto == "sqlite":
+            stmt = sqlite_insert(table)
+            return stmt.on_conflict_do_update(
+                index_elements=[key], set_={c: stmt.excluded[c] for c in columnas}
+            )
+        raise ValueError(f"Upsert masivo no soportado para '{dialecto}'")
 
     @staticmethod
-    def upsert_presupuestos(
-        press_f: pd.DataFrame,
+    def bulk_upsert(
+        df: pd.DataFrame,
+        model,
+        key: str,
         session: Session,
         logger: logging.Logger,
-        tracker_presup: ProcessTracker = ProcessTracker(),
-    ):
-        tracker_presup.increment_processed()
-        logger.info("Iniciando carga de presupuestos...\n")
+        tracker: ProcessTracker,
+        batch_size: int = 1000,
+        quarantine_dir: str | None = None,
+    ) -> list[dict]:
+        """Upsert por lotes con ``executemany``: una sentencia cada ``batch_size``
+        filas en lugar de un objeto ORM por fila. Devuelve la cuarentena."""
+        stmt = Loader.upsert_statement(session, model, key)
+        filas = Loader.rows(df, model)
+
+        # Solo para separar nuevos de actualizados en el tracker
+        existentes = Loader.existing_rows(
+            session, model, key, [f[key] for f in filas], []
+        )
 
-        # 🔹 1. Cachear todos los vendedores una sola vez
-        vendedores: dict = {v.nombre: v for v in session.exec(select(Vendedor)).all()}
+        def on_ok(lote: list) -> None:
+            for fila in lote:
+                if fila[key] in existentes:
+                    tracker.add_update(fila[key], ["upsert"])
+                else:
+                    tracker.add_new(fila[key])
+
+        return Loader.write_batches(
+            session,
+            filas,
+            lambda lote: session.execute(stmt, lote),
+            on_ok,
+            lambda fila: fila[key],
+            model.__tablename__,
+            logger,
+            tracker,
+            batch_size,
+            quarantine_dir,
+        )
 
-        # 🔹 2. Obtener presupuestos existentes una sola vez
-        reservas_existentes: dict = {
-            p.reserva: p for p in session.exec(select(Presupuesto)).all()
-        }
+    @staticmethod
+    def write_load_file(filas: list[dict], columnas: list[str], ruta: str) -> None:
+        """Archivo para ``LOAD DATA``: campos entre comillas separados por tab,
+        ``NULL`` sin comillas para los nulos."""
 
-        for index, row in press_f.iterrows():
+        def campo(valor) -> str:
+            if valor is None:
+                return "NULL"
+            return '"' + str(valor).replace('"', '""') + '"'
 
-            try:
-                vendedor_nombre = row.get("vendedor")
-                vendedor_obj: Vendedor = vendedores.get(vendedor_nombre)
-                if not vendedor_obj:
-                    logger.warning(
-                        f"  ⚠️  Vendedor '{vendedor_nombre}' no encontrado, saltando..."
-                    )
-                    tracker_presup.add_error(
-                        row.get("reserva"),
-                        f"Vendedor '{vendedor_nombre}' no encontrado",
-                    )
-                    continue
-
-                rva_key = row.get("reserva")
-                data = dict(
-                    reserva=ProcessData.clean_nan(row.get("reserva")),
-                    tipo_reserva=ProcessData.clean_nan(row.get("tipo_reserva")),
-                    ultima_modif=ProcessData.clean_nan(row.get("ultima_modif")),
-                    fecha_reserva=ProcessData.clean_nan(row.get("fecha_reserva")),
-                    fecha_salida=ProcessData.clean_nan(row.get("fecha_salida")),
-                    cliente=ProcessData.clean_nan(row.get("cliente")),
-                    vendedor_id=vendedor_obj.vendedor_id,
-                    nombre_grupo=ProcessData.clean_nan(row.get("nombre_grupo")),
-                    estado=ProcessData.clean_nan(row.get("estado")),
-                    can_adu=ProcessData.clean_nan(row.get("can_adu")),
-                    can_chd=ProcessData.clean_nan(row.get("can_chd")),
-                    moneda=ProcessData.clean_nan(row.get("moneda")),
-                    total=ProcessData.clean_nan(row.get("total")),
-                    ganancia=ProcessData.clean_nan(row.get("ganancia")),
-                    costo_final=ProcessData.clean_nan(row.get("costo_final")),
-                    productos=ProcessData.clean_nan(row.get("productos")),
+        with open(ruta, "w", encoding="utf-8", newline="\n") as f:
+            for fila in filas:
+                f.write("\t".join(campo(fila.get(c)) for c in columnas) + "\n")
+
+    @staticmethod
+    def staging_merge(
+        df: pd.DataFrame,
+        model,
+        key: str,
+        session: Session,
+        logger: logging.Logger,
+        tracker: ProcessTracker,
+        batch_size: int = 1000,
+    ) -> list[dict]:
+        """Carga vía tabla temporal: copia ``df`` a ``stg_<tabla>`` (``LOAD DATA
+        LOCAL INFILE`` en MySQL, ``executemany`` en SQLite) y hace un solo
+        ``INSERT ... SELECT`` con upsert sobre el índice único de ``key``.
+
+        En MySQL el engine tiene que permitir ``local_infile`` (por ejemplo
+        ``ENGINE_PATH=mysql+pymysql://...?local_infile=1``).
+
+        No aísla filas: si el merge falla no se escribe nada y el error sube
+        (``Loader.upsert`` reintenta entonces con ``bulk_upsert``); si no,
+        queda todo guardado y la cuarentena devuelta está vacía."""
+        destino = model.__table__
+        columnas = [c.name for c in destino.columns if not c.primary_key]
+        staging = Table(
+            f"stg_{destino.name}",
+            MetaData(),
+            *[Column(c, destino.columns[c].type) for c in columnas],
+            prefixes=["TEMPORARY"],
+        )
+        conexion = session.connection()
+        dialecto = conexion.dialect.name
+        staging.drop(conexion, checkfirst=True)
+        staging.create(conexion)
+
+        # --- 1. Copia a la tabla temporal ---
+        filas = Loader.rows(df, model)
+        if dialecto == "mysql":
+            with tempfile.TemporaryDirectory() as carpeta:
+                ruta = os.path.join(carpeta, f"{staging.name}.tsv")
+                Loader.write_load_file(filas, columnas, ruta)
+                session.execute(
+                    text(
+                        f"LOAD DATA LOCAL INFILE :ruta INTO TABLE {staging.name} "
+                        "CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' "
+                        "ENCLOSED BY '\"' ESCAPED BY '' LINES TERMINATED BY '\\n' "
+                        f"({', '.join(columnas)})"
+                    ),
+                    {"ruta": ruta.replace(os.sep, "/")},
+                )
+        elif dialecto == "sqlite":
+            for inicio in range(0, len(filas), batch_size):
+                session.execute(staging.insert(), filas[inicio : inicio + batch_size])
+        else:
+            raise ValueError(f"Carga por staging no soportada para '{dialecto}'")
+        logger.info(f"  📥 {len(filas)} filas copiadas a {staging.name}")
+
+        # --- 2. Claves ya existentes (para el tracker) ---
+        existentes = set(
+            session.execute(
+                text(
+                    f"SELECT s.{key} FROM {staging.name} s "
+                    f"JOIN {destino.name} t ON t.{key} = s.{key}"
                 )
+            ).scalars()
+        )
 
-                # 🔹 Si ya existe → actualizar
-                if rva_key in reservas_existentes:
-                    obj = reservas_existentes[rva_key]
-                    cambios = {}
-                    for k, v in data.items():
-                        actual = getattr(obj, k)
-                        if actual != v:
-                            cambios[k] = (actual, v)
-                            setattr(obj, k, v)
-
-                    if cambios:
-                        logger.info(
-                            f"  🔄 Actualizado {rva_key}: {list(cambios.keys())}"
-                        )
-                        tracker_presup.add_update(
-                            row.get("reserva"), list(cambios.keys())
-                        )
-                # 🔹 Si no existe → crear nuevo
-                else:
-                    session.add(Presupuesto(**data))
-                    logger.info(f"  📝 Creado nuevo: {rva_key}")
-                    tracker_presup.add_new(row.get("reserva"))
+        # --- 3. Merge en una sola sentencia ---
+        lista = ", ".join(columnas)
+        origen = f"SELECT {lista} FROM {staging.name}"
+        if dialecto == "mysql":
+            asignaciones = ", ".join(f"{c} = nuevo.{c}" for c in columnas if c != key)
+            merge = (
+                f"INSERT INTO {destino.name} ({lista}) "
+                f"SELECT * FROM ({origen}) AS nuevo "
+                f"ON DUPLICATE KEY UPDATE {asignaciones}"
+            )
+        else:
+            asignaciones = ", ".join(
+                f"{c} = excluded.{c}" for c in columnas if c != key
+            )
+            # El WHERE true evita la ambigüedad del parser de SQLite con ON CONFLICT
+            merge = (
+                f"INSERT INTO {destino.name} ({lista}) {origen} WHERE true "
+                f"ON CONFLICT ({key}) DO UPDATE SET {asignaciones}"
+            )
+        session.execute(text(merge))
 
-            except SQLAlchemyError as e:
-                logger.error(f"  ❌ Error SQL en {row.get('reserva')}: {e}")
-                tracker_presup.add_error(row.get("reserva"), f"Error SQL: {e}")
-                session.rollback()
-            except Exception as e:
-                logger.error(f"  ❌ Error SQL en {row.get('reserva')}: {e}")
-                tracker_presup.add_error(row.get("reserva"), f"Error SQL: {e}")
-                session.rollback()
-
-        # 🔹 Commit final
+        for clave in (fila[key] for fila in filas):
+            if clave in existentes:
+                tracker.add_update(clave, ["merge"])
+            else:
+                tracker.add_new(clave)
+
+        staging.drop(conexion)
         session.commit()
-        summary = tracker_presup.get_summary()
+        logger.info(f"  ✅ Merge de {staging.name} en {destino.name} completo")
+        return []
 
-        logger.info("Commit --Presupuestos-- final realizado.")
-        logger.info("📊 RESUMEN FINAL DEL PROCESO PRESUPUESTO")
-        logger.info("=" * 60)
-        logger.info(f"⏰ Duración total: {summary['duracion']}")
-        logger.info(f"📁 Total procesadas: {summary['stats']['total_procesadas']}")
-        logger.info(f"✨ Nuevos registros: {summary['stats']['nuevos']}")
-        logger.info(f"📝 Registros actualizados: {summary['stats']['actualizados']}")
-        logger.info(f"❌ Errores: {summary['stats']['errores']}")
-        logger.info("=" * 60)
-        logger.info("✅ PROCESO COMPLETADO")
-        logger.info("=" * 60)
+    @staticmethod
+    def rows(df, model) -> list[dict]:
+        """Filas de ``df`` con las columnas del modelo (sin la PK), con
+        ``vendedor_id`` ya resuelto por ``VendorResolver``."""
+        pk = model.__table__.primary_key.columns.keys()[0]
+        columnas = [c for c in model.__table__.columns.keys() if c != pk]
+        return [{c: row.get(c) for c in columnas} for row in Schema.to_records(df)]
 
     @staticmethod
-    def upsert_oddo(
-        oddo_f: pd.DataFrame,
+    def orm_upsert(
+        df,
+        model,
         session: Session,
         logger: logging.Logger,
-        tracker_oddo: ProcessTracker = ProcessTracker(),
-    ):
-        tracker_oddo.increment_processed()
-        logger.info("Iniciando carga de oddos...\n")
-        # 🔹 1. Cachear todos los vendedores
-        vendedores: dict = {
-            v.nombre_completo: v for v in session.exec(select(Vendedor)).all()
-        }
-
-        # 🔹 2. Cachear Oddos existentes por nombre_grupo
-        oddos_existentes: dict = {
-            o.nombre_grupo: o for o in session.exec(select(Oddo)).all()
-        }
+        tracker: ProcessTracker,
+        batch_size: int = 1000,
+        quarantine_dir: str | None = None,
+    ) -> list[dict]:
+        """Camino ORM: compara cada fila con la guardada y arma un alta o un
+        ``UPDATE`` por clave primaria solo con los campos que cambiaron.
+        Devuelve la cuarentena."""
+        pk = model.__table__.primary_key.columns.keys()[0]
+        key = model.__natural_key__
+
+        # 🔹 Filas existentes solo para las claves del lote
+        existentes: dict = Loader.existing_rows(session, model, key, df[key])
+        operaciones: list = []
+
+        for data in Loader.rows(df, model):
+            clave = data[key]
+
+            # 🔹 Si ya existe → actualizar solo lo que cambió
+            if clave in existentes:
+                obj = existentes[clave]
+                cambios = {k: v for k, v in data.items() if getattr(obj, k) != v}
+                if cambios:
+                    operaciones.append(
+                        {
+                            "clave": clave,
+                            "data": data,
+                            "update": {pk: getattr(obj, pk), **cambios},
+                            "campos": list(cambios.keys()),
+                        }
+                    )
 
-        for index, row in oddo_f.iterrows():
+            # 🔹 Si no existe → crear nuevo
+            else:
+                operaciones.append({"clave": clave, "data": data, "update": None})
 
-            try:
-                vendedor_nombre = row.get("vendedor")
-                vendedor_obj: Vendedor = vendedores.get(vendedor_nombre)
+        # 🔹 Escritura por lotes (SAVEPOINT + commit por lote)
+        return Loader.write_operations(
+            session, model, operaciones, logger, tracker, batch_size, quarantine_dir
+        )
 
-                if not vendedor_obj:
+    @staticmethod
+    def upsert(
+        df,
+        model,
+        session: Session,
+        logger: logging.Logger,
+        tracker: ProcessTracker | None = None,
+        strategy: str = "orm",
+        batch_size: int = 1000,
+        quarantine_dir: str | None = None,
+        vendors: VendorResolver | None = None,
+        contar: bool = True,
+    ):
+        """Carga ``df`` en la tabla de ``model``. Todo sale del modelo: las
+        columnas, la clave natural (``__natural_key__``) y el campo de
+        ``Vendedor`` con el que se resuelve ``vendedor`` (``__vendor_field__``).
+
+        ``strategy`` es "orm" (``orm_upsert``), "bulk" (``bulk_upsert``, lotes
+        de ``batch_size``) o "staging" (``staging_merge``). Las filas que
+        fallan van a ``quarantine_dir``. ``vendors`` resuelve ``vendedor_id``
+        (por defecto un ``VendorResolver`` sin cache ni alta automática).
+        Con ``contar=False`` no suma las filas al tracker (ya las contó quien
+        resolvió los vendedores, ver ``upsert_parallel``).
+
+        Devuelve las filas de ``df`` que quedaron guardadas (incluidas las que
+        no cambiaban): sin las que no tienen vendedor ni las de cuarentena."""
+        tracker = tracker or ProcessTracker(model.__tablename__)
+        vendors = vendors or VendorResolver()
+        nombre = model.__tablename__
+        key = model.__natural_key__
+        if contar:
+            tracker.increment_processed(Frames.num_rows(df))
+        logger.info(f"Iniciando carga de {nombre}...\n")
+
+        entrada = df
+        # 🔹 Solo filas nuevas o cambiadas (por row_hash)
+        with tracker.stage("sin_cambios"):
+            df = Loader.skip_unchanged(session, model, key, df, logger)
+        # 🔹 vendedor → vendedor_id para todo el lote (si no vino resuelto)
+        fallidas: set = set()
+        if "vendedor_id" not in Frames.columns(df):
+            with tracker.stage("vendedores"):
+                resueltas = vendors.resolve(df, model, session, logger, tracker)
+            fallidas = Loader.keys(df, key) - Loader.keys(resueltas, key)
+            df = resueltas
+
+        with tracker.stage("escritura"):
+            if strategy == "orm":
+                cuarentena = Loader.orm_upsert(
+                    df,
+                    model,
+                    session,
+                    logger,
+                    tracker,
+                    batch_size,
+                    quarantine_dir,
+                )
+            elif strategy == "bulk":
+                cuarentena = Loader.bulk_upsert(
+                    df,
+                    model,
+                    key,
+                    session,
+                    logger,
+                    tracker,
+                    batch_size,
+                    quarantine_dir,
+                )
+            elif strategy == "staging":
+                try:
+                    cuarentena = Loader.staging_merge(
+                        df,
+                        model,
+                        key,
+                        session,
+                        logger,
+                        tracker,
+                        batch_size,
+                    )
+                except SQLAlchemyError as e:
+                    # El merge es una sola sentencia: una fila mala lo tira
+                    # entero. Se repite por lotes para aislarla en cuarentena.
+                    session.rollback()
                     logger.warning(
-                        f"  ⚠️  Vendedor '{vendedor_nombre}' no encontrado, saltando..."
+                        f"  ⚠️  Falló el merge de {nombre} "
+                        f"({getattr(e, 'orig', e)}); se carga con bulk_upsert"
                     )
-                    tracker_oddo.add_error(
-                        row.get("nombre_grupo"),
-                        f"Vendedor '{vendedor_nombre}' no encontrado",
+                    cuarentena = Loader.bulk_upsert(
+                        df,
+                        model,
+                        key,
+                        session,
+                        logger,
+                        tracker,
+                        batch_size,
+                        quarantine_dir,
                     )
-                    continue
-
-                grupo_key = row.get("nombre_grupo")
-
-                # 🔹 Diccionario con todos los campos a actualizar/insertar
-                data = {
-                    "vendedor_id": vendedor_obj.vendedor_id,
-                    "ganancia_esperada": row.get("ganancia_esperada"),
-                    "estado": row.get("estado"),
-                }
-
-                # 🔹 Si ya existe → actualizar automáticamente
-                if grupo_key in oddos_existentes:
-                    obj = oddos_existentes[grupo_key]
-                    cambios = {}
-                    for k, v in data.items():
-                        actual = getattr(obj, k)
-                        if actual != v:
-                            cambios[k] = (actual, v)
-                            setattr(obj, k, v)
-
-                    if cambios:
-                        logger.info(
-                            f"  🔄 Actualizado {grupo_key}: {list(cambios.keys())}"
-                        )
-                        tracker_oddo.add_update(
-                            row.get("nombre_grupo"), list(cambios.keys())
-                        )
-
-                # 🔹 Si no existe → crear nuevo
-                else:
-                    new_oddo = Oddo(**data, nombre_grupo=grupo_key)
-                    session.add(new_oddo)
-                    logger.info(f"  📝 Creado nuevo: {grupo_key}")
-                    tracker_oddo.add_new(row.get("nombre_grupo"))
-
-            except Exception as e:
-                logger.error(f"  ❌ Error SQL en {row.get('reserva')}: {e}")
-                tracker_oddo.add_error(row.get("nombre_grupo"), f"Error SQL: {e}")
-                session.rollback()
-                continue
-
-        # 🔹 Commit final
-        session.commit()
-        summary = tracker_oddo.get_summary()
+            else:
+                raise ValueError(f"Estrategia de carga desconocida: '{strategy}'")
+
+        Loader.log_summary(tracker, nombre.upper(), logger)
+        fallidas |= {fila[key] for fila in cuarentena}
+        return Loader.without_keys(entrada, key, fallidas)
+
+    @staticmethod
+    def keys(df, key: str) -> set:
+        """Claves naturales de un ``DataFrame`` o ``pa.Table``."""
+        return set(Frames.column_to_pandas(df, key).tolist())
+
+    @staticmethod
+    def without_keys(df, key: str, claves: set):
+        """``df`` sin las filas cuya clave está en ``claves``."""
+        if not claves:
+            return df
+        fuera = Frames.column_to_pandas(df, key).isin(claves).to_numpy()
+        return Frames.filter(df, ~fuera)
+
+    @staticmethod
+    def upsert_parallel(
+        cargas: list[tuple],
+        engine,
+        logger: logging.Logger,
+        trackers: list[ProcessTracker],
+        vendors: VendorResolver | None = None,
+        **opciones,
+    ) -> list:
+        """Carga cada ``(df, model)`` de ``cargas`` al mismo tiempo, en su hilo
+        y con su propia ``Session`` (conexión del pool, transacción y
+        ``tracker``). Los vendedores se resuelven antes, una sola vez y en
+        orden, para que el alta automática no se pise entre tablas.
+
+        ``opciones`` son las de ``Loader.upsert`` (``strategy``, ``batch_size``,
+        ``quarantine_dir``). Devuelve, en el orden de ``cargas``, las filas
+        guardadas de cada tabla (ver ``Loader.upsert``). Si alguna tabla falla,
+        las demás terminan igual y después se relanza el primer error."""
+        vendors = vendors or VendorResolver()
+        resueltas: list = []
+        with Session(engine) as session:
+            for (df, model), tracker in zip(cargas, trackers):
+                # Se cuentan antes de quitar las filas sin vendedor
+                tracker.increment_processed(Frames.num_rows(df))
+                with tracker.stage("vendedores"):
+                    df = vendors.resolve(df, model, session, logger, tracker)
+                resueltas.append((df, model, tracker))
+
+        def cargar(df, model, tracker: ProcessTracker):
+            with Session(engine) as session:
+                return Loader.upsert(
+                    df,
+                    model,
+                    session,
+                    logger,
+                    tracker,
+                    vendors=vendors,
+                    contar=False,
+                    **opciones,
+                )
+
+        errores: list = []
+        with ThreadPoolExecutor(max_workers=len(resueltas) or 1) as pool:
+            futuros = {
+                pool.submit(cargar, df, model, tracker): i
+                for i, (df, model, tracker) in enumerate(resueltas)
+            }
+            guardadas: list = [None] * len(resueltas)
+            for futuro in as_completed(futuros):
+                i = futuros[futuro]
+                try:
+                    guardadas[i] = futuro.result()
+                except Exception as e:
+                    nombre = resueltas[i][1].__tablename__
+                    logger.error(f"❌ Falló la carga de {nombre}: {e}")
+                    errores.append(e)
+        if errores:
+            raise errores[0]
+        return guardadas
+
+    @staticmethod
+    def log_summary(tracker: ProcessTracker, nombre: str, logger: logging.Logger):
+        summary = tracker.get_summary()
 
-        logger.info("Commit --Oddo-- final realizado.")
-        logger.info("📊 RESUMEN FINAL DEL PROCESO ODDO")
+        logger.info(f"Commit --{nombre.capitalize()}-- final realizado.")
+        logger.info(f"📊 RESUMEN FINAL DEL PROCESO {nombre}")
         logger.info("=" * 60)
         logger.info(f"⏰ Duración total: {summary['duracion']}")
         logger.info(f"📁 Total procesadas: {summary['stats']['total_procesadas']}")
         logger.info(f"✨ Nuevos registros: {summary['stats']['nuevos']}")
         logger.info(f"📝 Registros actualizados: {summary['stats']['actualizados']}")
         logger.info(f"❌ Errores: {summary['stats']['errores']}")
+        for etapa, segundos in summary["etapas"].items():
+            logger.info(f"⏱️  {etapa}: {segundos} s")
         logger.info("=" * 60)
         logger.info("✅ PROCESO COMPLETADO")
         logger.info("=" * 60)
@@ -0,0 +1,93 @@
+import pandas as pd
+import datetime, logging
+from sqlmodel import Session
+from Pipeline.model import SyncState
+from Pipeline.frames import Frames
+
+
+class Watermark:
+    """Marcas de agua por fuente para la sincronización incremental.
+
+    Cada fuente ("reservas", "presupuestos", ...) guarda en ``sync_state`` la
+    mayor fecha de modificación ya cargada; la próxima corrida solo pide lo
+    modificado desde esa fecha. Las fuentes de Traffic se piden por rango de
+    fechas, así que su marca es por rango (``Watermark.key``): una corrida de
+    otro rango no saltea lo que cambió fuera del suyo.
+    """
+
+    @staticmethod
+    def key(
+        fuente: str,
+        fecha_desde: datetime.date | None = None,
+        fecha_hasta: datetime.date | None = None,
+    ) -> str:
+        """Clave de ``sync_state``: la fuente y, si se pide por rango, el rango."""
+        if fecha_desde is None or fecha_hasta is None:
+            return fuente
+        return f"{fuente}:{fecha_desde:%Y%m%d}-{fecha_hasta:%Y%m%d}"
+
+    @staticmethod
+    def get(session: Session, fuente: str) -> datetime.datetime | None:
+        estado = session.get(SyncState, fuente)
+        return estado.marca if estado else None
+
+    @staticmethod
+    def only_changed(
+        df: pd.DataFrame, marca: datetime.datetime | None, col: str = "ultima_modif"
+    ) -> pd.DataFrame:
+        """Filas modificadas desde la marca (inclusive: Traffic guarda solo el día)."""
+        if marca is None or col not in Frames.columns(df):
+            return df
+        if Frames.is_arrow(df):
+            from Pipeline.arrow_engine import ArrowData
+
+            return ArrowData.only_changed(df, marca, col)
+        if df.empty:
+            return df
+        fechas = pd.to_datetime(df[col], errors="coerce")
+        return df[fechas >= pd.Timestamp(marca)]
+
+    @staticmethod
+    def pending(cargadas, guardadas, key: str, col: str):
+        """``col`` de las filas de ``cargadas`` que no están en ``guardadas``
+        (sin vendedor o en cuarentena)."""
+        cargadas = Frames.to_pandas(cargadas, [key, col])
+        guardadas = Frames.column_to_pandas(guardadas, key)
+        return cargadas.loc[~cargadas[key].isin(guardadas), col]
+
+    @staticmethod
+    def update(
+        session: Session,
+        fuente: str,
+        valores: pd.Series,
+        logger: logging.Logger,
+        pendientes: pd.Series | None = None,
+    ) -> None:
+        """Avanza la marca al máximo de ``valores`` (solo filas guardadas).
+
+        Si hay ``pendientes`` (fechas de filas que no se guardaron) la marca
+        queda antes de la más vieja, para que la próxima corrida las vuelva a
+        pedir. No hace commit."""
+        nueva = pd.to_datetime(valores, errors="coerce").max()
+        if pendientes is not None and len(pendientes):
+            primera = pd.to_datetime(pendientes, errors="coerce").min()
+            if not pd.isna(primera) and (pd.isna(nueva) or primera <= nueva):
+                # Un segundo antes: Odoo filtra con ">" y Traffic con ">=" del día
+                nueva = primera - pd.Timedelta(seconds=1)
+                logger.warning(
+                    f"  ⚠️  Marca de agua '{fuente}' retenida en {nueva}: "
+                    f"{len(pendientes)} filas sin guardar"
+                )
+        if pd.isna(nueva):
+            return
+        nueva = nueva.to_pydatetime()
+
+        estado = session.get(SyncState, fuente)
+        if estado is None:
+            estado = SyncState(fuente=fuente)
+        if estado.marca is not None and estado.marca >= nueva:
+            return
+        estado.marca = nueva
+        estado.actualizado = datetime.datetime.now()
+        session.add(estado)
+        logger.info(f"Marca de agua '{fuente}' → {nueva}")
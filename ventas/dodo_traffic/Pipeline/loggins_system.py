@@ -1,17 +1,42 @@
-import logging
+import atexit, json, logging, os, queue, time
+from logging.handlers import QueueHandler, QueueListener
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 
 
 ##########################################################################################
 # RELACIONADO CON LOGS
-def setup_logging():
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.StreamHandler(),  # También muestra en consola
-        ],
-    )
+class _DeferredQueueHandler(QueueHandler):
+    """Encola el record sin formatearlo: el mensaje, la fecha y el traceback
+    se arman en el hilo del ``QueueListener``, no en el que está cargando."""
+
+    def prepare(self, record):
+        return record
+
+
+_listener: QueueListener | None = None
+
+
+def setup_logging(level: str | int | None = None):
+    """Logging asíncrono: el root logger solo encola y un ``QueueListener``
+    escribe en consola desde otro hilo. Se configura una sola vez; llamadas
+    siguientes solo cambian el nivel (``LOG_LEVEL=DEBUG`` muestra el detalle
+    por fila del loader)."""
+    global _listener
+    # Se lee acá y no al importar: el .env se carga recién con Pipeline.utils
+    level = level or os.getenv("LOG_LEVEL", "INFO")
+    if _listener is None:
+        consola = logging.StreamHandler()  # También muestra en consola
+        consola.setFormatter(
+            logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        )
+        _listener = QueueListener(queue.SimpleQueue(), consola)
+        logging.getLogger().handlers = [_DeferredQueueHandler(_listener.queue)]
+        _listener.start()
+        # Al salir se vacía la cola antes de cerrar
+        atexit.register(_listener.stop)
+    logging.getLogger().setLevel(level)
 
     logger = logging.getLogger(__name__)
     logger.info("=" * 60)
@@ -21,46 +46,60 @@ def setup_logging():
 
 
 class ProcessTracker:
-    """Clase para trackear el proceso y generar reportes"""
+    """Contadores del proceso de carga, tiempos por etapa y exportación de
+    métricas.
 
-    def __init__(self):
+    El detalle por registro es opcional: con ``sample_every=N`` se guarda uno
+    de cada N nuevos / actualizados y todos los errores, siempre en buffers
+    acotados a ``max_records`` (los más viejos se descartan).
+    """
+
+    def __init__(
+        self, nombre: str = "proceso", sample_every: int = 0, max_records: int = 1000
+    ):
+        self.nombre = nombre
+        self.sample_every = sample_every
         self.stats = {
             "nuevos": 0,
             "actualizados": 0,
             "errores": 0,
             "total_procesadas": 0,
         }
-        self.updated_records = []
-        self.error_records = []
-        self.new_records = []
+        self.stages: dict = {}
+        self.updated_records = deque(maxlen=max_records)
+        self.error_records = deque(maxlen=max_records)
+        self.new_records = deque(maxlen=max_records)
         self.start_time = datetime.now()
 
+    def _sample(self, contador: str) -> bool:
+        """Uno de cada ``sample_every`` (el primero, el N+1, ...)."""
+        return bool(self.sample_every) and (
+            (self.stats[contador] - 1) % self.sample_every == 0
+        )
+
     def add_new(self, reserva):
         """Registra un nuevo registro"""
         self.stats["nuevos"] += 1
-        self.new_records.append(
-            {
-                "reserva": reserva,
-                "accion": "NUEVO",
-                "timestamp": datetime.now(),
-            }
-        )
+        if self._sample("nuevos"):
+            self.new_records.append(
+                {"reserva": reserva, "accion": "NUEVO", "timestamp": datetime.now()}
+            )
 
     def add_update(self, reserva, changed_fields):
         """Registra una actualización"""
         self.stats["actualizados"] += 1
-        self.updated_records.append(
-            {
-                "reserva": reserva,
-                "accion": "ACTUALIZADO",
-                "timestamp": datetime.now(),
-                "detalle": f'Campos actualizados: {", ".join(changed_fields)}',
-            }
-        )
-        print(self.updated_records[-1])
+        if self._sample("actualizados"):
+            self.updated_records.append(
+                {
+                    "reserva": reserva,
+                    "accion": "ACTUALIZADO",
+                    "timestamp": datetime.now(),
+                    "detalle": f'Campos actualizados: {", ".join(changed_fields)}',
+                }
+            )
 
     def add_error(self, reserva, error_msg):
-        """Registra un error"""
+        """Registra un error (el detalle se guarda siempre, en el buffer acotado)"""
         self.stats["errores"] += 1
         self.error_records.append(
             {
@@ -71,9 +110,20 @@ class ProcessTracker:
             }
         )
 
-    def increment_processed(self):
+    def increment_processed(self, filas: int = 1):
         """Incrementa el contador de filas procesadas"""
-        self.stats["total_procesadas"] += 1
+        self.stats["total_procesadas"] += filas
+
+    @contextmanager
+    def stage(self, nombre: str):
+        """Suma a ``stages[nombre]`` los segundos que tarda el bloque."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[nombre] = (
+                self.stages.get(nombre, 0.0) + time.perf_counter() - inicio
+            )
 
     def get_summary(self):
         """Retorna un resumen del proceso"""
@@ -85,4 +135,73 @@ class ProcessTracker:
             "fin": end_time,
             "duracion": str(duration),
             "stats": self.stats,
+            "etapas": {k: round(v, 3) for k, v in self.stages.items()},
+        }
+
+    def metrics(self) -> dict:
+        """Métricas de la corrida, serializables a JSON."""
+        return {
+            "nombre": self.nombre,
+            "inicio": self.start_time.isoformat(),
+            "duracion_segundos": round(
+                (datetime.now() - self.start_time).total_seconds(), 3
+            ),
+            "stats": dict(self.stats),
+            "etapas_segundos": {k: round(v, 3) for k, v in self.stages.items()},
+        }
+
+    def prometheus_samples(self, prefijo: str = "dodo_etl") -> dict:
+        """Muestras en formato de texto de Prometheus, agrupadas por métrica."""
+        tabla = f'tabla="{self.nombre}"'
+        duracion = (datetime.now() - self.start_time).total_seconds()
+        return {
+            f"{prefijo}_rows": [
+                f'{prefijo}_rows{{{tabla},accion="{k}"}} {v}'
+                for k, v in self.stats.items()
+            ],
+            f"{prefijo}_stage_seconds": [
+                f'{prefijo}_stage_seconds{{{tabla},etapa="{k}"}} {v:.3f}'
+                for k, v in self.stages.items()
+            ],
+            f"{prefijo}_duration_seconds": [
+                f"{prefijo}_duration_seconds{{{tabla}}} {duracion:.3f}"
+            ],
+        }
+
+    @staticmethod
+    def export_metrics(
+        trackers: list, directorio: str, prefijo: str = "dodo_etl"
+    ) -> None:
+        """Escribe ``<prefijo>.json`` y ``<prefijo>.prom`` (para el textfile
+        collector de node_exporter) con las métricas de ``trackers``. Los dos
+        archivos se reemplazan de forma atómica."""
+        tipos = {
+            # Valores de la última corrida (se reescriben cada vez): gauges
+            f"{prefijo}_rows": "gauge",
+            f"{prefijo}_stage_seconds": "gauge",
+            f"{prefijo}_duration_seconds": "gauge",
+            f"{prefijo}_last_run_timestamp_seconds": "gauge",
+        }
+        muestras: dict = {nombre: [] for nombre in tipos}
+        for t in trackers:
+            for nombre, lineas in t.prometheus_samples(prefijo).items():
+                muestras[nombre] += lineas
+        muestras[f"{prefijo}_last_run_timestamp_seconds"] = [
+            f"{prefijo}_last_run_timestamp_seconds {time.time():.0f}"
+        ]
+        prom = [
+            linea
+            for nombre, lineas in muestras.items()
+            for linea in [f"# TYPE {nombre} {tipos[nombre]}", *lineas]
+        ]
+
+        os.makedirs(directorio, exist_ok=True)
+        contenido = {
+            f"{prefijo}.json": json.dumps([t.metrics() for t in trackers], indent=2),
+            f"{prefijo}.prom": "\n".join(prom) + "\n",
         }
+        for archivo, texto in contenido.items():
+            ruta = os.path.join(directorio, archivo)
+            with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+                f.write(texto)
+            os.replace(ruta + ".tmp", ruta)
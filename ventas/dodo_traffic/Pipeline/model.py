@@ -1,6 +1,7 @@
 from typing import Optional
 from sqlmodel import SQLModel, Field
-from datetime import date
+from sqlalchemy import BigInteger
+from datetime import date, datetime
 from decimal import Decimal
 
 
@@ -14,8 +15,11 @@ class Vendedor(SQLModel, table=True):
 # Tabla presupuestos
 class Presupuesto(SQLModel, table=True):
     __tablename__ = "presupuestos"
+    # Clave natural y campo de Vendedor que usa Loader.upsert
+    __natural_key__ = "reserva"
+    __vendor_field__ = "nombre"
     reserva_id: int | None = Field(default=None, primary_key=True)
-    reserva: Optional[str] = Field(max_length=6)
+    reserva: Optional[str] = Field(max_length=6, unique=True)
     tipo_reserva: Optional[str] = Field(max_length=4)
     ultima_modif: Optional[date]
     fecha_reserva: Optional[date]
@@ -31,13 +35,20 @@ class Presupuesto(SQLModel, table=True):
     ganancia: float
     productos: Optional[str] = Field(max_length=255)
     vendedor_id: int = Field(foreign_key="vendedores.vendedor_id")
+    row_hash: Optional[int] = Field(
+        default=None,
+        sa_type=BigInteger,
+        description="Hash del contenido (ProcessData.row_hash)",
+    )
 
 
 # Tabla reservas
 class Reserva(SQLModel, table=True):
     __tablename__ = "reservas"
+    __natural_key__ = "reserva"
+    __vendor_field__ = "nombre_completo"
     reserva_id: int | None = Field(default=None, primary_key=True)
-    reserva: Optional[str] = Field(max_length=6)
+    reserva: Optional[str] = Field(max_length=6, unique=True)
     tipo_reserva: Optional[str] = Field(max_length=4)
     ultima_modif: Optional[date]
     fecha_reserva: Optional[date]
@@ -54,13 +65,20 @@ class Reserva(SQLModel, table=True):
     eje_reservas_para: Optional[str] = Field(max_length=200)
     descrip_productos: Optional[str] = Field(max_length=255)
     vendedor_id: int = Field(foreign_key="vendedores.vendedor_id")
+    row_hash: Optional[int] = Field(
+        default=None,
+        sa_type=BigInteger,
+        description="Hash del contenido (ProcessData.row_hash)",
+    )
 
 
 # Tabla oddo (CRM)
 class Oddo(SQLModel, table=True):
     __tablename__ = "oddos"
+    __natural_key__ = "nombre_grupo"
+    __vendor_field__ = "nombre_completo"
     oddo_id: int | None = Field(default=None, primary_key=True)
-    nombre_grupo: Optional[str] = Field(max_length=255)
+    nombre_grupo: Optional[str] = Field(max_length=255, unique=True)
     ganancia_esperada: Optional[str] = Field(max_length=100)
     estado: Optional[str] = Field(
         max_length=50,
@@ -69,3 +87,18 @@ class Oddo(SQLModel, table=True):
         "'Cancelado', 'Armando Propuesta', '4º FUP', '2º FUP', '5º FUP'",
     )
     vendedor_id: int = Field(foreign_key="vendedores.vendedor_id")
+    row_hash: Optional[int] = Field(
+        default=None,
+        sa_type=BigInteger,
+        description="Hash del contenido (ProcessData.row_hash)",
+    )
+
+
+# Estado de sincronización incremental (una fila por fuente)
+class SyncState(SQLModel, table=True):
+    __tablename__ = "sync_state"
+    fuente: str = Field(primary_key=True, max_length=50)
+    marca: Optional[datetime] = Field(
+        default=None, description="Última fecha de modificación ya cargada"
+    )
+    actualizado: Optional[datetime] = Field(default=None)
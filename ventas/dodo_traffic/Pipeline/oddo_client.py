@@ -0,0 +1,168 @@
+import datetime, logging
+import pandas as pd
+import requests
+
+
+class OddoError(Exception):
+    """Error devuelto por el JSON-RPC de Odoo."""
+
+
+class OddoClient:
+    """Extracción de ``crm.lead`` por JSON-RPC, sin navegador.
+
+    Hace login en ``/web/session/authenticate`` (la cookie de sesión queda en
+    el ``requests.Session``) y trae los leads en lotes grandes con
+    ``search_read``, pidiendo solo los campos necesarios.
+    """
+
+    FIELDS: list = [
+        "name",
+        "email_from",
+        "user_id",
+        "expected_revenue",
+        "stage_id",
+        "write_date",
+    ]
+    # Lo mismo que muestra la vista de pipeline (los archivados quedan afuera)
+    DOMAIN: list = [["type", "=", "opportunity"]]
+
+    def __init__(
+        self,
+        base_url: str,
+        db: str,
+        username: str,
+        password: str,
+        batch_size: int = 2000,
+        timeout: float = 60,
+        logger: logging.Logger | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.db = db
+        self.username = username
+        self.password = password
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+        self.session = requests.Session()
+        self.uid: int | None = None
+
+    def _call(self, path: str, params: dict):
+        response = self.session.post(
+            f"{self.base_url}{path}",
+            json={"jsonrpc": "2.0", "method": "call", "params": params, "id": 1},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+        if data.get("error"):
+            error = data["error"]
+            detalle = error.get("data", {}).get("message") or error.get("message")
+            raise OddoError(f"{path}: {detalle}")
+        return data.get("result")
+
+    def authenticate(self) -> int:
+        result = self._call(
+            "/web/session/authenticate",
+            {"db": self.db, "login": self.username, "password": self.password},
+        )
+        if not result or not result.get("uid"):
+            raise OddoError("Login de Odoo rechazado")
+        self.uid = result["uid"]
+        return self.uid
+
+    def search_read(
+        self,
+        model: str,
+        domain: list,
+        fields: list[str],
+        offset: int = 0,
+        limit: int | None = None,
+        order: str = "id",
+    ) -> list[dict]:
+        return self._call(
+            f"/web/dataset/call_kw/{model}/search_read",
+            {
+                "model": model,
+                "method": "search_read",
+                "args": [domain],
+                "kwargs": {
+                    "fields": fields,
+                    "offset": offset,
+                    "limit": limit or self.batch_size,
+                    "order": order,
+                },
+            },
+        )
+
+    def iter_leads(self, domain: list | None = None, fields: list[str] | None = None):
+        """Genera los leads de a lotes de ``batch_size``."""
+        if self.uid is None:
+            self.authenticate()
+        domain = self.DOMAIN if domain is None else domain
+        fields = fields or self.FIELDS
+
+        offset = 0
+        while True:
+            batch = self.search_read("crm.lead", domain, fields, offset=offset)
+            if not batch:
+                break
+            yield batch
+            offset += len(batch)
+            self.logger.info(f"Oddo: {offset} leads descargados")
+            if len(batch) < self.batch_size:
+                break
+
+    @staticmethod
+    def format_revenue(valor, prefijo: str = "U$D") -> str:
+        """Mismo formato que muestra la vista de lista (``U$D 1.234,50``)."""
+        texto = f"{float(valor or 0):,.2f}"
+        texto = texto.replace(",", "_").replace(".", ",").replace("_", ".")
+        return f"{prefijo} {texto}"
+
+    @staticmethod
+    def to_frame(leads: list[dict], prefijo: str = "U$D") -> pd.DataFrame:
+        """Leads de ``search_read`` con las columnas del scraper de la grilla."""
+
+        def many2one(valor) -> str:
+            # Odoo devuelve [id, "nombre"] o False
+            return valor[1] if valor else ""
+
+        rows = [
+            {
+                "name": lead.get("name") or "",
+                "email_from": lead.get("email_from") or "",
+                "user_id": many2one(lead.get("user_id")),
+                "expected_revenue": OddoClient.format_revenue(
+                    lead.get("expected_revenue"), prefijo
+                ),
+                "stage_id": many2one(lead.get("stage_id")),
+                "write_date": lead.get("write_date") or None,
+            }
+            for lead in leads
+        ]
+        return pd.DataFrame(
+            rows,
+            columns=[
+                "name",
+                "email_from",
+                "user_id",
+                "expected_revenue",
+                "stage_id",
+                "write_date",
+            ],
+        )
+
+    def get_leads(
+        self, modificado_desde: datetime.datetime | None = None, prefijo: str = "U$D"
+    ) -> pd.DataFrame:
+        """Leads del pipeline; con ``modificado_desde`` solo los que cambiaron
+        después (``write_date`` de Odoo, en UTC)."""
+        domain = list(self.DOMAIN)
+        if modificado_desde is not None:
+            domain.append(
+                ["write_date", ">", modificado_desde.strftime("%Y-%m-%d %H:%M:%S")]
+            )
+        leads: list = []
+        for batch in self.iter_leads(domain):
+            leads.extend(batch)
+        return OddoClient.to_frame(leads, prefijo)
@@ -0,0 +1,52 @@
+import gzip, hashlib, json, os
+
+# No depende de Pipeline.utils para poder usarse también desde Martin/scraper.py
+
+
+class RawCache:
+    """Cache en disco de las respuestas crudas (JSON comprimido con gzip).
+
+    Cada respuesta se guarda por contenido: la clave es el endpoint más un hash
+    del payload enviado, así la misma consulta siempre cae en el mismo archivo.
+    En modo ``replay`` no se toca la red: todo se lee del cache y una consulta
+    que no esté guardada es un error.
+    """
+
+    def __init__(self, root: str, replay: bool = False):
+        self.root = root
+        self.replay = replay
+
+    @staticmethod
+    def key(endpoint: str, payload: dict) -> str:
+        canonico = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(f"{endpoint}\n{canonico}".encode()).hexdigest()
+
+    def path(self, endpoint: str, payload: dict) -> str:
+        key = RawCache.key(endpoint, payload)
+        return os.path.join(self.root, endpoint, key[:2], f"{key}.json.gz")
+
+    def get(self, endpoint: str, payload: dict):
+        """Respuesta guardada o ``None``."""
+        path = self.path(endpoint, payload)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def put(self, endpoint: str, payload: dict, response) -> None:
+        path = self.path(endpoint, payload)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+            json.dump(response, f, default=str)
+        os.replace(path + ".tmp", path)
+
+    def replay_get(self, endpoint: str, payload: dict):
+        """Lectura en modo replay: falla si la consulta no está en el cache."""
+        response = self.get(endpoint, payload)
+        if response is None:
+            raise KeyError(
+                f"Replay: no hay respuesta guardada para '{endpoint}' "
+                f"({RawCache.key(endpoint, payload)[:12]}). "
+                "Correr una vez sin --replay con el mismo rango para grabarla."
+            )
+        return response
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+from Pipeline.frames import Frames
+
+
+class Schema:
+    """Tipos de las columnas procesadas (Traffic y Oddo).
+
+    Se aplica una vez al limpiar los datos y se mantiene hasta el loader, que
+    recién en ``to_records`` convierte a tipos de Python para la base:
+
+    - ``category``: pocos valores distintos (estado, moneda, tipo, vendedor).
+    - ``Int16``: enteros chicos con nulos (pasajeros).
+    - ``date`` / ``datetime``: ``datetime64[s]`` (pandas no admite resolución
+      de día); las ``date`` se pasan a la base sin hora.
+    - ``cents``: importes en punto fijo, ``Int64`` en centavos.
+    """
+
+    COLUMNS: dict = {
+        "tipo_reserva": "category",
+        "estado": "category",
+        "moneda": "category",
+        "vendedor": "category",
+        "can_adu": "Int16",
+        "can_chd": "Int16",
+        "ultima_modif": "date",
+        "fecha_reserva": "date",
+        "fecha_salida": "date",
+        "fecha_fin": "date",
+        "write_date": "datetime",
+        "total": "cents",
+        "ganancia": "cents",
+        "costo_final": "cents",
+    }
+
+    @staticmethod
+    def apply(df: pd.DataFrame) -> pd.DataFrame:
+        """Convierte las columnas declaradas presentes en ``df``. Es idempotente:
+        las que ya tienen el tipo final no se tocan."""
+        for col, tipo in Schema.COLUMNS.items():
+            if col not in df.columns:
+                continue
+            s = df[col]
+            if tipo == "category":
+                if not isinstance(s.dtype, pd.CategoricalDtype):
+                    df[col] = s.astype("category")
+            elif tipo == "Int16":
+                if s.dtype != "Int16":
+                    df[col] = pd.to_numeric(s, errors="coerce").round(0).astype("Int16")
+            elif tipo in ("date", "datetime"):
+                if s.dtype != "datetime64[s]":
+                    df[col] = pd.to_datetime(s, errors="coerce").astype("datetime64[s]")
+            elif tipo == "cents":
+                if s.dtype != "Int64":
+                    df[col] = (
+                        (pd.to_numeric(s, errors="coerce") * 100)
+                        .round(0)
+                        .astype("Int64")
+                    )
+        return df
+
+    @staticmethod
+    def to_db(df: pd.DataFrame) -> pd.DataFrame:
+        """Copia con valores de Python listos para la base: ``date`` /
+        ``datetime`` para las fechas, ``float`` para los importes,
+        ``int``/``str`` y ``None``."""
+        out = {}
+        for col in df.columns:
+            s = df[col]
+            tipo = Schema.COLUMNS.get(col)
+            if tipo == "date" and s.dtype.kind == "M":
+                valores = s.dt.date.to_numpy(dtype=object)
+            elif tipo == "datetime" and s.dtype.kind == "M":
+                valores = np.array(
+                    [None if pd.isna(v) else v.to_pydatetime() for v in s], dtype=object
+                )
+            elif tipo == "cents" and s.dtype == "Int64":
+                valores = np.array(
+                    (s.astype("Float64") / 100).round(2).tolist(), dtype=object
+                )
+            else:
+                valores = np.array(s.tolist(), dtype=object)
+            valores[pd.isna(valores)] = None
+            out[col] = valores
+        return pd.DataFrame(out, index=df.index, dtype=object)
+
+    @staticmethod
+    def to_records(df) -> list[dict]:
+        if Frames.is_arrow(df):
+            from Pipeline.arrow_engine import ArrowData
+
+            return ArrowData.to_records(df)
+        return Schema.to_db(df).to_dict("records")
@@ -1,11 +1,21 @@
 import pandas as pd
 from bs4 import BeautifulSoup
-import time, logging, requests, datetime
+import time, logging, datetime, asyncio, threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from functools import partial
+from typing import Callable
+from urllib.parse import urlsplit
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from Pipeline.utils import Paths
+from Pipeline.functions import ProcessData
+from Pipeline.sharding import Sharding
+from Pipeline.session_cache import SessionCache
+from Pipeline.raw_cache import RawCache
+from Pipeline.oddo_client import OddoClient, OddoError
+from Pipeline.traffic_client import TrafficClient, Endpoint, RESERVAS, PRESUPUESTOS
 
 # from utils import Paths
 
@@ -125,99 +135,144 @@ class Scraper:
         driver.quit()
         return pd.concat(df_list, ignore_index=True)
 
+    @staticmethod
+    def get_oddo(
+        logger: logging.Logger, modificado_desde: datetime.datetime | None = None
+    ) -> pd.DataFrame:
+        """Leads de Odoo por JSON-RPC (``OddoClient``), sin abrir el navegador.
+        Con ``modificado_desde`` solo los modificados después de esa fecha."""
+        if not Paths.ODDO_DB:
+            raise OddoError(
+                "ODDO_MODE=api necesita ODDO_DB (nombre de la base de Odoo); "
+                "configurarlo o usar ODDO_MODE=selenium"
+            )
+        base_url = Paths.ODDO_URL
+        if not base_url:
+            # Por defecto, el mismo host que la página de login
+            partes = urlsplit(Paths.URL_LOGIN_ODDO)
+            base_url = f"{partes.scheme}://{partes.netloc}"
+        client = OddoClient(
+            base_url,
+            Paths.ODDO_DB,
+            Paths.ODDO_USERNAME,
+            Paths.ODDO_PASSWORD,
+            batch_size=Paths.ODDO_BATCH_SIZE,
+            logger=logger,
+        )
+        return client.get_leads(modificado_desde)
+
+    @staticmethod
+    async def collect_frame(
+        client: TrafficClient,
+        endpoint: Endpoint,
+        body: dict,
+        url_data: str | None = None,
+        process_chunk: Callable[[pd.DataFrame], pd.DataFrame] | None = None,
+    ) -> pd.DataFrame:
+        """Junta las páginas de un listado en un DataFrame.
+
+        Con ``process_chunk`` (modo streaming) cada página se convierte en un
+        DataFrame y se limpia en un hilo apenas llega, mientras el event loop
+        sigue bajando las siguientes; nunca se acumula la lista completa de
+        diccionarios.
+        """
+        if process_chunk is None:
+            all_data = await client.fetch_all(endpoint, body, url_data)
+            return pd.DataFrame(all_data, columns=endpoint.columns)
+
+        chunks: list = []
+        en_proceso = None
+        filas = 0
+        async for data in client.paginate(endpoint, body, url_data):
+            page = pd.DataFrame(data, columns=endpoint.columns)
+            filas += len(page)
+            del data
+            # Como mucho una página procesándose a la vez, para acotar memoria
+            if en_proceso is not None:
+                chunks.append(await en_proceso)
+            en_proceso = asyncio.create_task(asyncio.to_thread(process_chunk, page))
+            client.logger.info(f"{endpoint.nombre}: {filas} filas recibidas")
+        if en_proceso is not None:
+            chunks.append(await en_proceso)
+        return pd.concat(chunks, ignore_index=True)
+
+    @staticmethod
+    def fetch_traffic(
+        endpoint: Endpoint,
+        body: dict,
+        cookies: dict,
+        url_data: str | None = None,
+        max_workers: int = Paths.TRAFFIC_MAX_WORKERS,
+        cache: RawCache | None = None,
+        process_chunk: Callable[[pd.DataFrame], pd.DataFrame] | None = None,
+    ) -> pd.DataFrame:
+        """Descarga todas las filas de un listado de Traffic con ``TrafficClient``.
+
+        Las páginas se piden hasta ``max_workers`` a la vez sobre un mismo pool
+        de conexiones y se devuelven en orden.
+        """
+
+        async def run() -> pd.DataFrame:
+            async with TrafficClient(
+                cookies,
+                max_connections=max_workers,
+                page_size=Paths.TRAFFIC_PAGE_SIZE,
+                cache=cache,
+            ) as client:
+                return await Scraper.collect_frame(
+                    client, endpoint, body, url_data, process_chunk
+                )
+
+        return asyncio.run(run())
+
+    @staticmethod
+    def traffic_criteria(
+        fecha_desde: datetime.date,
+        fecha_hasta: datetime.date,
+        modificado_desde: datetime.date | None = None,
+    ) -> list:
+        """Filtro de Traffic por fecha de salida y, en modo incremental, por
+        fecha de modificación."""
+        criteria = [
+            [["Fec_sal"], ">=", fecha_desde.strftime("%Y-%m-%d")],
+            "and",
+            [["Fec_sal"], "<", fecha_hasta.strftime("%Y-%m-%d")],
+        ]
+        if modificado_desde is not None:
+            criteria = [
+                criteria,
+                "and",
+                [["Fec_mod"], ">=", modificado_desde.strftime("%Y-%m-%d")],
+            ]
+        return criteria
+
     @staticmethod
     def get_reserva(
         fecha_desde: datetime.date,
         fecha_hasta: datetime.date,
         cookies: dict,
         url_data: str = Paths.URL_DATA_TRAFFIC,
+        max_workers: int = Paths.TRAFFIC_MAX_WORKERS,
+        modificado_desde: datetime.date | None = None,
+        cache: RawCache | None = None,
+        stream: bool = False,
     ) -> pd.DataFrame:
-        session = requests.Session()
-        # Agregar cookies a la sesión
-        for name, value in cookies.items():
-            session.cookies.set(name, value, domain="traffic.welcomelatinamerica.com")
-
-        all_data = []
-        skip = 0
-        # Cabeceras
-        headers = {
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "Content-Type": "application/json",
-            "X-Requested-With": "XMLHttpRequest",
-            "Origin": "https://traffic.welcomelatinamerica.com",
-            "Referer": url_data,
-            "User-Agent": "Mozilla/5.0",
-        }
-        while True:
-            payload = {
-                "Take": 2500,
-                "Skip": skip,
-                "Criteria": [
-                    [["Fec_sal"], ">=", fecha_desde.strftime("%Y-%m-%d")],
-                    "and",
-                    [["Fec_sal"], "<", fecha_hasta.strftime("%Y-%m-%d")],
-                ],
-                "IncludeColumns": [
-                    "Idreserva",
-                    "Tiporva",
-                    "Fec_mod",
-                    "Fec_rva",
-                    "Fec_sal",
-                    "Fec_fin",
-                    "Rva",
-                    "Nombreagencia_cod_agcia",
-                    "Estado",
-                    "Can_adu",
-                    "Can_chd",
-                    "Descripparame_moneda",
-                    "Nombregrupo",
-                    "Nombrevendedor_cod_vdor",
-                    "Total",
-                    "gananciaTotal",
-                    "Tipocont",
-                    "Descripparame_productos",
-                ],
-            }
-
-            response = session.post(
-                url_data, headers=headers, cookies=cookies, json=payload
+        """Con ``stream=True`` devuelve las filas ya limpias (``ProcessData``),
+        falta solo ``ProcessData.finalize``."""
+        body = {
+            "Criteria": Scraper.traffic_criteria(
+                fecha_desde, fecha_hasta, modificado_desde
             )
-
-            if response.status_code != 200:
-                logging.debug(f"Error, status: {response.status_code}")
-                print("Error:", response.status_code)
-                break
-
-            data = response.json().get("Entities", [])
-            if not data:
-                break  # No quedan más filas
-
-            all_data.extend(data)
-            skip += 2500
-            print(f"Traído {len(data)} filas, total acumulado: {len(all_data)}")
-
-            columnas = [
-                "Idreserva",
-                "Rva",
-                "Tiporva",
-                "Fec_mod",
-                "Fec_rva",
-                "Fec_sal",
-                "Fec_fin",
-                "Nombreagencia_cod_agcia",  # cliente
-                "Nombrevendedor_cod_vdor",
-                "Nombregrupo",
-                "Estado",
-                "Can_adu",
-                "Can_chd",
-                "Moneda",
-                "Total",
-                "gananciaTotal",
-                "Tipocont",
-                "Descripparame_productos",
-            ]
-
-            return pd.DataFrame(all_data, columns=columnas)
+        }
+        return Scraper.fetch_traffic(
+            RESERVAS,
+            body,
+            cookies,
+            url_data,
+            max_workers=max_workers,
+            cache=cache,
+            process_chunk=ProcessData.clean_rva if stream else None,
+        )
 
     @staticmethod
     def get_presupesto(
@@ -225,101 +280,31 @@ class Scraper:
         fecha_hasta: datetime.date,
         cookies: dict,
         url_data: str = Paths.URL_DATA_TRAFFIC_PRESUPUESTO,
+        max_workers: int = Paths.TRAFFIC_MAX_WORKERS,
+        modificado_desde: datetime.date | None = None,
+        cache: RawCache | None = None,
+        stream: bool = False,
     ) -> pd.DataFrame:
-        headers = {
-            "Accept": "application/json, text/javascript, */*; q=0.01",
-            "Content-Type": "application/json",
-            "X-Requested-With": "XMLHttpRequest",
-            "Origin": "https://traffic.welcomelatinamerica.com",
-            "Referer": url_data,
-            "User-Agent": "Mozilla/5.0",
-        }
-
-        session = requests.Session()
-        # Agregar cookies a la sesión
-        for name, value in cookies.items():
-            session.cookies.set(name, value, domain="traffic.welcomelatinamerica.com")
-
-        all_data = []
-        skip = 0
-
-        while True:
-            payload = {
-                "Take": 2500,
-                "Skip": skip,
-                "Criteria": [
-                    [["Fec_sal"], ">=", fecha_desde.strftime("%Y-%m-%d")],
-                    "and",
-                    [["Fec_sal"], "<", fecha_hasta.strftime("%Y-%m-%d")],
-                ],
-                "IncludeColumns": [
-                    "Idpresupu",
-                    "Rva",
-                    "Tiporva",
-                    "Fec_mod",
-                    "Fec_rva",
-                    "Fec_sal",
-                    "Nombreagencia_cod_agcia",
-                    "Observ",
-                    "Estado",
-                    "Can_adu",
-                    "Can_chd",
-                    "Moneda",
-                    "Nombrevendedor_cod_vdor",
-                    "Total",
-                    "costoConIva",
-                    "GananciaTotal",
-                    "Productos",
-                ],
-            }
-
-            response = session.post(
-                url_data, headers=headers, cookies=cookies, json=payload
+        """Con ``stream=True`` devuelve las filas ya limpias (``ProcessData``),
+        falta solo ``ProcessData.finalize``."""
+        body = {
+            "Criteria": Scraper.traffic_criteria(
+                fecha_desde, fecha_hasta, modificado_desde
             )
-
-            if response.status_code != 200:
-                logging.debug(f"Error, status: {response.status_code}")
-                print("Error:", response.status_code)
-                print(
-                    "Detalle del servidor:", response.text[:1000]
-                )  # muestra los primeros 1000 caracteres
-                break
-
-            data = response.json().get("Entities", [])
-            if not data:
-                break  # No quedan más filas
-
-            all_data.extend(data)
-            skip += 2500
-            print(f"Traído {len(data)} filas, total acumulado: {len(all_data)}")
-
-        cols: list = [
-            "Idpresupu",
-            "Rva",
-            "Tiporva",
-            "Fec_mod",
-            "Fec_rva",
-            "Fec_sal",
-            "Nombreagencia_cod_agcia",
-            "Observ",
-            "Estado",
-            "Can_adu",
-            "Can_chd",
-            "Moneda",
-            "Nombrevendedor_cod_vdor",
-            "Total",
-            "costoConIva",
-            "GananciaTotal",
-            "Productos",
-        ]
-        return pd.DataFrame(all_data, columns=cols)
+        }
+        return Scraper.fetch_traffic(
+            PRESUPUESTOS,
+            body,
+            cookies,
+            url_data,
+            max_workers=max_workers,
+            cache=cache,
+            process_chunk=ProcessData.clean_pres if stream else None,
+        )
 
     @staticmethod
-    def scrape_all(
-        fecha_desde: datetime.date,
-        fecha_hasta: datetime.date,
-        logger: logging.Logger,
-    ):
+    def login_traffic(logger: logging.Logger) -> list[dict]:
+        """Login en Traffic con Chrome headless. Devuelve las cookies de Selenium."""
         options = webdriver.ChromeOptions()
         options.add_argument("--start-maximized")  # maximiza ventana
         options.add_argument("--headless")  # modo headless
@@ -355,16 +340,181 @@ class Scraper:
         logger.info("Ingreso.")
 
         selenium_cookies = driver.get_cookies()
-        cookies = {c["name"]: c["value"] for c in selenium_cookies}
+        driver.quit()
+        return selenium_cookies
 
-        reservas: pd.DataFrame = Scraper.get_reserva(fecha_desde, fecha_hasta, cookies)
-        logger.info("Reserevas terminado. Esperando presupuestos...")
-        presupuestos: pd.DataFrame = Scraper.get_presupesto(
-            fecha_desde, fecha_hasta, cookies
+    @staticmethod
+    def traffic_cookies(logger: logging.Logger) -> dict:
+        """Cookies de Traffic, reutilizando la sesión cacheada si sigue válida."""
+        cache = SessionCache(Paths.TRAFFIC_SESSION_CACHE, Paths.TRAFFIC_PASSWORD)
+        return cache.get_cookies(
+            lambda: Scraper.login_traffic(logger), Paths.URL_DATA_TRAFFIC, logger
         )
-        driver.quit()
-        logger.info("Presupuesto terminado. Esperando oddo...")
-        oddo: pd.DataFrame = Scraper.scrape_oddo()
-        logger.info("Oddo terminado. Proceso de scraping finalizado.")
+
+    @staticmethod
+    def run_sources(
+        fuentes: dict[str, Callable[[], pd.DataFrame]],
+        logger: logging.Logger,
+        timeouts: dict | None = None,
+        concurrent: bool = True,
+    ) -> dict[str, pd.DataFrame | None]:
+        """Corre cada fuente en su propio hilo y junta los resultados.
+
+        Cada fuente tiene su timeout (segundos desde el arranque común) y sus
+        errores quedan aislados: una fuente que falla o se pasa de tiempo
+        devuelve ``None`` y no afecta a las demás.
+
+        Los hilos son daemon: una fuente colgada no se puede cortar, pero se
+        abandona (sigue corriendo en segundo plano hasta terminar sola) y ni
+        esta función ni el cierre del proceso la esperan.
+        """
+        timeouts = timeouts or {}
+        resultados: dict = {}
+
+        if not concurrent:
+            for nombre, fn in fuentes.items():
+                try:
+                    resultados[nombre] = fn()
+                except Exception as e:
+                    logger.error(f"  ❌ Fuente '{nombre}' falló: {e}")
+                    resultados[nombre] = None
+            return resultados
+
+        def correr(fn: Callable, future: Future) -> None:
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+
+        inicio = time.monotonic()
+        futures: dict = {}
+        for nombre, fn in fuentes.items():
+            futures[nombre] = Future()
+            threading.Thread(
+                target=correr,
+                args=(fn, futures[nombre]),
+                name=f"fuente-{nombre}",
+                daemon=True,
+            ).start()
+        for nombre, future in futures.items():
+            limite = timeouts.get(nombre)
+            restante = (
+                None if limite is None else max(limite - (time.monotonic() - inicio), 0)
+            )
+            try:
+                resultados[nombre] = future.result(timeout=restante)
+                logger.info(
+                    f"Fuente '{nombre}' terminada en {time.monotonic() - inicio:.1f}s"
+                )
+            except FutureTimeout:
+                logger.error(f"  ❌ Fuente '{nombre}' superó el timeout de {limite}s")
+                resultados[nombre] = None
+            except Exception as e:
+                logger.error(f"  ❌ Fuente '{nombre}' falló: {e}")
+                resultados[nombre] = None
+        return resultados
+
+    @staticmethod
+    def scrape_all(
+        fecha_desde: datetime.date,
+        fecha_hasta: datetime.date,
+        logger: logging.Logger,
+        shard: str | None = Paths.TRAFFIC_SHARD,
+        modificado_desde: dict | None = None,
+        cache: RawCache | None = None,
+        stream: bool = Paths.TRAFFIC_STREAM,
+        concurrent: bool = Paths.SCRAPE_CONCURRENT,
+        timeouts: dict | None = None,
+    ):
+        """Descarga reservas, presupuestos y oddo.
+
+        Las tres fuentes corren a la vez (``concurrent``), cada una con su
+        timeout (``Paths.SOURCE_TIMEOUTS``); una fuente que falla devuelve
+        ``None`` en su lugar y las otras siguen.
+
+        ``modificado_desde`` (fuente → fecha) activa el modo incremental: en
+        Traffic solo se piden filas con ``Fec_mod`` desde esa fecha y en Odoo los
+        leads con ``write_date`` posterior (solo en modo api).
+        Con ``cache`` las respuestas crudas se graban (o se leen, en modo replay).
+        Con ``stream`` reservas y presupuestos se limpian página por página
+        mientras se descargan y se devuelven ya procesados.
+        """
+        modificado_desde = modificado_desde or {}
+        replay = cache is not None and cache.replay
+
+        logger.info("=" * 60)
+        # Un solo login para reservas y presupuestos, hecho dentro de las
+        # fuentes: si falla, caen esas dos y Odoo sigue
+        sesion: dict = {}
+        sesion_lock = threading.Lock()
+
+        def cookies() -> dict:
+            with sesion_lock:
+                if not sesion:
+                    try:
+                        # En replay no hace falta sesión: no se toca la red
+                        sesion["cookies"] = (
+                            {} if replay else Scraper.traffic_cookies(logger)
+                        )
+                    except Exception as e:
+                        sesion["error"] = e
+                if "error" in sesion:
+                    raise sesion["error"]
+                return sesion["cookies"]
+
+        def traffic(nombre: str, fetcher: Callable, finalize: Callable):
+            params = {
+                "modificado_desde": modificado_desde.get(nombre),
+                "stream": stream,
+            }
+            fetcher = partial(fetcher, cache=cache, **params)
+
+            def run() -> pd.DataFrame:
+                if shard:
+                    # Ventanas independientes y en paralelo para rangos grandes
+                    df = Sharding.fetch(
+                        fetcher,
+                        nombre,
+                        fecha_desde,
+                        fecha_hasta,
+                        cookies(),
+                        logger,
+                        freq=shard,
+                        params=params,
+                    )
+                else:
+                    df = fetcher(fecha_desde, fecha_hasta, cookies())
+                return finalize(df) if stream else df
+
+            return run
+
+        def oddo() -> pd.DataFrame:
+            oddo_desde = modificado_desde.get("oddo")
+            oddo_key = {"write_date": oddo_desde} if oddo_desde else {}
+            if replay:
+                return pd.DataFrame(cache.replay_get("oddo", oddo_key))
+            if Paths.ODDO_MODE == "selenium":
+                df = Scraper.scrape_oddo()
+            else:
+                df = Scraper.get_oddo(logger, oddo_desde)
+            if cache is not None:
+                cache.put("oddo", oddo_key, df.to_dict("records"))
+            return df
+
+        resultados = Scraper.run_sources(
+            {
+                "reservas": traffic(
+                    "reservas", Scraper.get_reserva, ProcessData.finalize
+                ),
+                "presupuestos": traffic(
+                    "presupuestos", Scraper.get_presupesto, ProcessData.finalize
+                ),
+                "oddo": oddo,
+            },
+            logger,
+            timeouts=timeouts or Paths.SOURCE_TIMEOUTS,
+            concurrent=concurrent,
+        )
+        logger.info("Proceso de scraping finalizado.")
         logger.info("=" * 60)
-        return reservas, presupuestos, oddo
+        return resultados["reservas"], resultados["presupuestos"], resultados["oddo"]
@@ -0,0 +1,97 @@
+import base64, hashlib, json, logging, os, time
+from typing import Callable
+import requests
+from cryptography.fernet import Fernet, InvalidToken
+
+# No depende de Pipeline.utils para poder usarse también desde Martin/scraper.py
+
+
+class SessionCache:
+    """Cookies de Traffic guardadas cifradas en disco entre corridas.
+
+    El archivo se cifra con Fernet usando una clave derivada de la contraseña de
+    Traffic (PBKDF2 + sal aleatoria guardada junto al archivo). Antes de
+    reutilizar las cookies se valida la sesión con un pedido mínimo; si no hay
+    cookies, vencieron o el servidor las rechaza, se llama a ``login`` (Selenium).
+    """
+
+    def __init__(self, path: str, secret: str | None, ttl: int = 8 * 3600):
+        if not secret:
+            raise ValueError(
+                "TRAFFIC_PASSWORD no está configurada: hace falta para cifrar "
+                "el cache de sesión de Traffic"
+            )
+        self.path = path
+        self.secret = secret
+        self.ttl = ttl
+
+    def _fernet(self, salt: bytes) -> Fernet:
+        key = hashlib.pbkdf2_hmac("sha256", self.secret.encode(), salt, 200_000)
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    def load(self) -> dict | None:
+        """Cookies guardadas, o ``None`` si no hay, vencieron o no se pueden leer."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                salt, token = f.read().split(b"\n", 1)
+            data = json.loads(self._fernet(base64.b64decode(salt)).decrypt(token))
+        except (ValueError, InvalidToken, OSError):
+            return None
+        if data.get("expira", 0) <= time.time():
+            return None
+        return data.get("cookies")
+
+    def save(self, selenium_cookies: list[dict]) -> dict:
+        """Guarda las cookies de Selenium. El vencimiento es el de la primera
+        cookie que venza (o ``ttl`` si son todas de sesión)."""
+        cookies = {c["name"]: c["value"] for c in selenium_cookies}
+        vencimientos = [c["expiry"] for c in selenium_cookies if c.get("expiry")]
+        expira = min(vencimientos + [time.time() + self.ttl])
+
+        salt = os.urandom(16)
+        token = self._fernet(salt).encrypt(
+            json.dumps({"cookies": cookies, "expira": expira}).encode()
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path + ".tmp", "wb") as f:
+            f.write(base64.b64encode(salt) + b"\n" + token)
+        os.replace(self.path + ".tmp", self.path)
+        return cookies
+
+    @staticmethod
+    def is_valid(cookies: dict, check_url: str, timeout: float = 10) -> bool:
+        """Pedido autenticado mínimo (una fila) para saber si la sesión sigue viva."""
+        try:
+            response = requests.post(
+                check_url,
+                headers={
+                    "Accept": "application/json",
+                    "Content-Type": "application/json",
+                    "X-Requested-With": "XMLHttpRequest",
+                },
+                cookies=cookies,
+                json={"Take": 1, "Skip": 0},
+                timeout=timeout,
+                allow_redirects=False,
+            )
+            return response.status_code == 200 and "Entities" in response.json()
+        except (requests.RequestException, ValueError):
+            return False
+
+    def get_cookies(
+        self,
+        login: Callable[[], list[dict]],
+        check_url: str,
+        logger: logging.Logger,
+    ) -> dict:
+        """Cookies válidas: las del cache si el servidor las acepta, si no las de
+        un login nuevo (que quedan guardadas para la próxima)."""
+        cookies = self.load()
+        if cookies and SessionCache.is_valid(cookies, check_url):
+            logger.info("Sesión de Traffic reutilizada desde el cache.")
+            return cookies
+
+        logger.info("Sin sesión válida en cache, iniciando login...")
+        return self.save(login())
@@ -0,0 +1,141 @@
+import pandas as pd
+import datetime, hashlib, json, logging, os, shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+from Pipeline.utils import Paths
+
+
+class Sharding:
+    """Parte un rango de fechas en ventanas (mensuales o semanales) y descarga
+    cada ventana por separado y en paralelo.
+
+    Cada ventana descargada se guarda en su propio archivo dentro de
+    ``Paths.SHARDS_DIR``; si una ventana falla, al volver a correr el mismo
+    rango ese día solo se pide de nuevo esa ventana. Cuando todas terminan
+    bien los archivos se borran.
+    """
+
+    @staticmethod
+    def windows(
+        fecha_desde: datetime.date, fecha_hasta: datetime.date, freq: str = "month"
+    ) -> list[tuple[datetime.date, datetime.date]]:
+        """Ventanas [desde, hasta) que cubren el rango completo."""
+        if freq not in ("month", "week"):
+            raise ValueError(f"Frecuencia de ventana desconocida: {freq!r}")
+
+        ventanas = []
+        inicio = fecha_desde
+        while inicio < fecha_hasta:
+            if freq == "month":
+                fin = (inicio.replace(day=1) + datetime.timedelta(days=32)).replace(
+                    day=1
+                )
+            else:
+                # Hasta el próximo lunes
+                fin = inicio + datetime.timedelta(days=7 - inicio.weekday())
+            fin = min(fin, fecha_hasta)
+            ventanas.append((inicio, fin))
+            inicio = fin
+        return ventanas
+
+    @staticmethod
+    def shard_path(
+        nombre: str,
+        fecha_desde: datetime.date,
+        fecha_hasta: datetime.date,
+        ventana: tuple[datetime.date, datetime.date],
+        shard_dir: str = Paths.SHARDS_DIR,
+        params: dict | None = None,
+    ) -> str:
+        """Archivo de una ventana. La carpeta depende del rango pedido, del día
+        de la corrida y de ``params`` (los parámetros del fetcher), así un
+        reintento el mismo día reutiliza lo ya bajado pero una corrida con otro
+        ``modificado_desde`` o ``stream`` no mezcla sus ventanas."""
+        firma = hashlib.sha1(
+            json.dumps(params or {}, sort_keys=True, default=str).encode()
+        ).hexdigest()[:8]
+        corrida = (
+            f"{nombre}_{fecha_desde:%Y%m%d}_{fecha_hasta:%Y%m%d}"
+            f"_{datetime.date.today():%Y%m%d}_{firma}"
+        )
+        archivo = f"{ventana[0]:%Y%m%d}_{ventana[1]:%Y%m%d}.pkl"
+        return os.path.join(shard_dir, corrida, archivo)
+
+    @staticmethod
+    def fetch(
+        fetcher: Callable[[datetime.date, datetime.date, dict], pd.DataFrame],
+        nombre: str,
+        fecha_desde: datetime.date,
+        fecha_hasta: datetime.date,
+        cookies: dict,
+        logger: logging.Logger,
+        freq: str = "month",
+        max_windows: int = Paths.TRAFFIC_MAX_WINDOWS,
+        retries: int = 1,
+        shard_dir: str = Paths.SHARDS_DIR,
+        params: dict | None = None,
+    ) -> pd.DataFrame:
+        """Descarga ``fetcher`` ventana por ventana con hasta ``max_windows``
+        ventanas en simultáneo y devuelve el resultado concatenado en orden.
+
+        Si alguna ventana sigue fallando después de ``retries`` reintentos se
+        lanza ``RuntimeError``; las ventanas correctas quedan guardadas.
+        ``params`` son los parámetros con los que se armó ``fetcher`` y forman
+        parte de la carpeta de la corrida (ver ``shard_path``).
+        """
+        ventanas = Sharding.windows(fecha_desde, fecha_hasta, freq)
+        if not ventanas:
+            return fetcher(fecha_desde, fecha_hasta, cookies)
+        paths = {
+            v: Sharding.shard_path(
+                nombre, fecha_desde, fecha_hasta, v, shard_dir, params
+            )
+            for v in ventanas
+        }
+
+        def descargar(ventana) -> None:
+            df = fetcher(ventana[0], ventana[1], cookies)
+            path = paths[ventana]
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Se escribe a un temporal y se renombra para no dejar archivos a medias
+            df.to_pickle(path + ".tmp")
+            os.replace(path + ".tmp", path)
+
+        pendientes = [v for v in ventanas if not os.path.exists(paths[v])]
+        logger.info(
+            f"{nombre}: {len(ventanas)} ventanas ({freq}), "
+            f"{len(ventanas) - len(pendientes)} ya descargadas."
+        )
+
+        fallidas: dict = {}
+        for intento in range(retries + 1):
+            if not pendientes:
+                break
+            if intento:
+                logger.info(f"{nombre}: reintentando {len(pendientes)} ventanas...")
+            fallidas = {}
+            with ThreadPoolExecutor(max_workers=max(max_windows, 1)) as executor:
+                futures = {executor.submit(descargar, v): v for v in pendientes}
+                for future in as_completed(futures):
+                    ventana = futures[future]
+                    try:
+                        future.result()
+                        logger.info(f"{nombre}: ventana {ventana[0]} → {ventana[1]} OK")
+                    except Exception as e:
+                        logger.error(
+                            f"  ❌ {nombre}: ventana {ventana[0]} → {ventana[1]} falló: {e}"
+                        )
+                        fallidas[ventana] = e
+            pendientes = [v for v in ventanas if v in fallidas]
+
+        if fallidas:
+            detalle = ", ".join(f"{v[0]} → {v[1]}" for v in fallidas)
+            raise RuntimeError(
+                f"{nombre}: fallaron {len(fallidas)} ventanas ({detalle}). "
+                "Las demás quedaron guardadas; volver a correr para reintentar solo esas."
+            )
+
+        df = pd.concat([pd.read_pickle(paths[v]) for v in ventanas], ignore_index=True)
+        # Corrida completa: se borran las ventanas para no reutilizarlas después
+        shutil.rmtree(os.path.dirname(paths[ventanas[0]]), ignore_errors=True)
+        return df
@@ -0,0 +1,259 @@
+import asyncio, collections, logging, os
+from dataclasses import dataclass
+from typing import AsyncIterator
+import httpx
+from Pipeline.raw_cache import RawCache
+
+# No depende de Pipeline.utils para poder usarse también desde Martin/scraper.py
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """Listado de Traffic: URL (por variable de entorno) y columnas."""
+
+    nombre: str
+    url_env: str
+    # Columnas pedidas al servidor (IncludeColumns); None = las que devuelva
+    include_columns: tuple[str, ...] | None = None
+    # Columnas del DataFrame resultante; None = todas las recibidas
+    columns: tuple[str, ...] | None = None
+
+    @property
+    def url(self) -> str:
+        return os.getenv(self.url_env)
+
+
+RESERVAS = Endpoint(
+    nombre="reservas",
+    url_env="URL_DATA_TRAFFIC",
+    include_columns=(
+        "Idreserva",
+        "Tiporva",
+        "Fec_mod",
+        "Fec_rva",
+        "Fec_sal",
+        "Fec_fin",
+        "Rva",
+        "Nombreagencia_cod_agcia",
+        "Estado",
+        "Can_adu",
+        "Can_chd",
+        "Descripparame_moneda",
+        "Nombregrupo",
+        "Nombrevendedor_cod_vdor",
+        "Total",
+        "gananciaTotal",
+        "Tipocont",
+        "Descripparame_productos",
+    ),
+    columns=(
+        "Idreserva",
+        "Rva",
+        "Tiporva",
+        "Fec_mod",
+        "Fec_rva",
+        "Fec_sal",
+        "Fec_fin",
+        "Nombreagencia_cod_agcia",  # cliente
+        "Nombrevendedor_cod_vdor",
+        "Nombregrupo",
+        "Estado",
+        "Can_adu",
+        "Can_chd",
+        "Moneda",
+        "Total",
+        "gananciaTotal",
+        "Tipocont",
+        "Descripparame_productos",
+    ),
+)
+
+PRESUPUESTOS = Endpoint(
+    nombre="presupuestos",
+    url_env="URL_DATA_TRAFFIC_PRESUPUESTO",
+    include_columns=(
+        "Idpresupu",
+        "Rva",
+        "Tiporva",
+        "Fec_mod",
+        "Fec_rva",
+        "Fec_sal",
+        "Nombreagencia_cod_agcia",
+        "Observ",
+        "Estado",
+        "Can_adu",
+        "Can_chd",
+        "Moneda",
+        "Nombrevendedor_cod_vdor",
+        "Total",
+        "costoConIva",
+        "GananciaTotal",
+        "Productos",
+    ),
+    columns=(
+        "Idpresupu",
+        "Rva",
+        "Tiporva",
+        "Fec_mod",
+        "Fec_rva",
+        "Fec_sal",
+        "Nombreagencia_cod_agcia",
+        "Observ",
+        "Estado",
+        "Can_adu",
+        "Can_chd",
+        "Moneda",
+        "Nombrevendedor_cod_vdor",
+        "Total",
+        "costoConIva",
+        "GananciaTotal",
+        "Productos",
+    ),
+)
+
+COSTO_RESERVA = Endpoint(
+    nombre="costo_reserva",
+    url_env="URL_DATA_TRAFFIC_COSTORESERVA",
+)
+
+
+class TrafficClient:
+    """Cliente asíncrono de los listados de Traffic.
+
+    Usa un único ``httpx.AsyncClient`` con pool de conexiones y keep-alive, así
+    varias páginas y varios endpoints se piden a la vez en el mismo event loop.
+    Con ``cache`` cada página se graba en un ``RawCache`` (o se lee de él en
+    modo replay, sin red)::
+
+        async with TrafficClient(cookies) as client:
+            async for page in client.paginate(RESERVAS, {"Criteria": criteria}):
+                ...
+    """
+
+    def __init__(
+        self,
+        cookies: dict,
+        max_connections: int = 4,
+        page_size: int = 2500,
+        timeout: float = 120,
+        logger: logging.Logger | None = None,
+        cache: RawCache | None = None,
+    ):
+        self.cookies = cookies
+        self.cache = cache
+        self.max_connections = max(max_connections, 1)
+        self.page_size = page_size
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+        self._client: httpx.AsyncClient | None = None
+
+    async def __aenter__(self) -> "TrafficClient":
+        self._client = httpx.AsyncClient(
+            cookies=self.cookies,
+            headers={
+                "Accept": "application/json, text/javascript, */*; q=0.01",
+                "Content-Type": "application/json",
+                "X-Requested-With": "XMLHttpRequest",
+                "Origin": "https://traffic.welcomelatinamerica.com",
+                "User-Agent": "Mozilla/5.0",
+            },
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            timeout=self.timeout,
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._client.aclose()
+        self._client = None
+
+    async def get_page(
+        self, endpoint: Endpoint, body: dict, skip: int, url: str | None = None
+    ) -> dict:
+        """Una página del listado (respuesta JSON completa, con ``TotalCount``)."""
+        url = url or endpoint.url
+        payload = {"Take": self.page_size, "Skip": skip, **body}
+        if endpoint.include_columns is not None:
+            payload["IncludeColumns"] = list(endpoint.include_columns)
+
+        if self.cache is not None and self.cache.replay:
+            return self.cache.replay_get(endpoint.nombre, payload)
+
+        response = await self._client.post(url, json=payload, headers={"Referer": url})
+        if response.status_code != 200:
+            self.logger.error(
+                f"{endpoint.nombre}: error {response.status_code} (Skip={skip}): "
+                f"{response.text[:1000]}"
+            )
+            response.raise_for_status()
+        data = response.json()
+        if self.cache is not None:
+            self.cache.put(endpoint.nombre, payload, data)
+        return data
+
+    async def paginate(
+        self, endpoint: Endpoint, body: dict, url: str | None = None
+    ) -> AsyncIterator[list[dict]]:
+        """Genera las páginas (listas de entidades) en orden.
+
+        Con el ``TotalCount`` de la primera página se piden las siguientes
+        con hasta ``max_connections`` páginas en vuelo por delante de la que
+        se está entregando. Si el servidor no
+        informa el total se pide página por página hasta recibir una vacía.
+        """
+        first = await self.get_page(endpoint, body, 0, url)
+        data = first.get("Entities", [])
+        yield data
+        if len(data) < self.page_size:
+            return
+
+        total = first.get("TotalCount")
+        if total is None:
+            skip = self.page_size
+            while True:
+                data = (await self.get_page(endpoint, body, skip, url)).get(
+                    "Entities", []
+                )
+                if not data:
+                    break  # No quedan más filas
+                yield data
+                skip += self.page_size
+            return
+
+        # Solo max_connections páginas por delante del consumidor: cada página
+        # entregada lanza la siguiente, así las respuestas no se acumulan en
+        # memoria si el consumidor (p. ej. el modo streaming) es más lento
+        skips = iter(range(self.page_size, total, self.page_size))
+        pendientes: collections.deque = collections.deque()
+
+        def lanzar() -> None:
+            skip = next(skips, None)
+            if skip is not None:
+                pendientes.append(
+                    asyncio.create_task(self.get_page(endpoint, body, skip, url))
+                )
+
+        for _ in range(self.max_connections):
+            lanzar()
+        try:
+            while pendientes:
+                data = (await pendientes.popleft()).get("Entities", [])
+                lanzar()
+                yield data
+        finally:
+            for task in pendientes:
+                task.cancel()
+
+    async def fetch_all(
+        self, endpoint: Endpoint, body: dict, url: str | None = None
+    ) -> list[dict]:
+        all_data: list = []
+        async for data in self.paginate(endpoint, body, url):
+            all_data.extend(data)
+            self.logger.info(
+                f"{endpoint.nombre}: traído {len(data)} filas, "
+                f"total acumulado: {len(all_data)}"
+            )
+        return all_data
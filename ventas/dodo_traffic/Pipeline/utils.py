@@ -1,21 +1,106 @@
 from sqlmodel import create_engine
+from sqlalchemy import Engine, make_url
 from dotenv import load_dotenv
-import os
+import functools, os
 
 
 class Paths:
     load_dotenv()
-    ENGINE = create_engine(os.getenv("ENGINE_PATH"))
+    # Base de datos: el engine se crea recién en el primer Paths.engine()
+    ENGINE_PATH: str | None = os.getenv(r"ENGINE_PATH")
+    DB_POOL_SIZE: int = int(os.getenv(r"DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv(r"DB_MAX_OVERFLOW", "10"))
+    # Segundos antes de reciclar una conexión (MySQL corta las inactivas)
+    DB_POOL_RECYCLE: int = int(os.getenv(r"DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv(r"DB_POOL_PRE_PING", "1") == "1"
+    DB_ISOLATION_LEVEL: str | None = os.getenv(r"DB_ISOLATION_LEVEL") or None
+    # Filas por INSERT multi-fila en executemany ("insertmanyvalues")
+    DB_INSERT_PAGE_SIZE: int = int(os.getenv(r"DB_INSERT_PAGE_SIZE", "1000"))
+    # Solo SQL Server con pyodbc
+    DB_FAST_EXECUTEMANY: bool = os.getenv(r"DB_FAST_EXECUTEMANY", "0") == "1"
     
     TRAFFIC_USERNAME: str = os.getenv(r"TRAFFIC_USERNAME")
     TRAFFIC_PASSWORD: str = os.getenv(r"TRAFFIC_PASSWORD")
     URL_LOGIN_TRAFFIC: str = os.getenv(r"URL_LOGIN_TRAFFIC")
     URL_DATA_TRAFFIC: str = os.getenv(r"URL_DATA_TRAFFIC")
     URL_DATA_TRAFFIC_PRESUPUESTO: str = os.getenv(r"URL_DATA_TRAFFIC_PRESUPUESTO")
+    TRAFFIC_SESSION_CACHE: str = os.getenv(
+        r"TRAFFIC_SESSION_CACHE", "traffic_session.bin"
+    )
     
     URL_LOGIN_ODDO: str = os.getenv(r"URL_LOGIN_ODDO")
     URL_DATA_ODDO: str = os.getenv(r"URL_DATA_ODDO")
     ODDO_USERNAME: str = os.getenv(r"ODDO_USERNAME")
     ODDO_PASSWORD: str = os.getenv(r"ODDO_PASSWORD")
+    ODDO_URL: str | None = os.getenv(r"ODDO_URL")  # p. ej. https://empresa.odoo.com
+    ODDO_DB: str | None = os.getenv(r"ODDO_DB")
+    # JSON-RPC de Odoo ("api") o el scraper de la grilla con Chrome ("selenium").
+    # Sin ODDO_MODE se usa la api solo si está configurado ODDO_DB
+    ODDO_MODE: str = os.getenv(r"ODDO_MODE") or ("api" if ODDO_DB else "selenium")
+    ODDO_BATCH_SIZE: int = int(os.getenv(r"ODDO_BATCH_SIZE", "2000"))
 
+    # Descarga de Traffic
+    TRAFFIC_PAGE_SIZE: int = int(os.getenv(r"TRAFFIC_PAGE_SIZE", "2500"))
+    TRAFFIC_MAX_WORKERS: int = int(os.getenv(r"TRAFFIC_MAX_WORKERS", "4"))
+    # Ventanas de fecha: "month", "week" o vacío para pedir el rango entero
+    TRAFFIC_SHARD: str | None = os.getenv(r"TRAFFIC_SHARD") or None
+    TRAFFIC_MAX_WINDOWS: int = int(os.getenv(r"TRAFFIC_MAX_WINDOWS", "3"))
+    SHARDS_DIR: str = os.getenv(r"SHARDS_DIR", "shards")
+    # Limpiar cada página mientras se descargan las siguientes
+    TRAFFIC_STREAM: bool = os.getenv(r"TRAFFIC_STREAM", "0") == "1"
+    # Motor de process_data sin streaming: "pandas" o "arrow" (requiere pyarrow)
+    PROCESS_ENGINE: str = os.getenv(r"PROCESS_ENGINE", "pandas")
 
+    # Fuentes en paralelo en scrape_all y timeout de cada una (segundos)
+    SCRAPE_CONCURRENT: bool = os.getenv(r"SCRAPE_CONCURRENT", "1") == "1"
+    SOURCE_TIMEOUTS: dict = {
+        "reservas": int(os.getenv(r"TIMEOUT_RESERVAS", "3600")),
+        "presupuestos": int(os.getenv(r"TIMEOUT_PRESUPUESTOS", "3600")),
+        "oddo": int(os.getenv(r"TIMEOUT_ODDO", "1800")),
+    }
+
+    # Carga: "orm" (fila por fila), "bulk" (INSERT ... ON DUPLICATE KEY por lotes)
+    # o "staging" (tabla temporal + merge; en MySQL requiere ?local_infile=1)
+    LOAD_STRATEGY: str = os.getenv(r"LOAD_STRATEGY", "orm")
+    LOAD_BATCH_SIZE: int = int(os.getenv(r"LOAD_BATCH_SIZE", "1000"))
+    # Reservas, presupuestos y oddos a la vez, cada una en su conexión del pool
+    LOAD_PARALLEL: bool = os.getenv(r"LOAD_PARALLEL", "0") == "1"
+    # CSV con las filas que la base rechazó (ver Loader.write_batches)
+    QUARANTINE_DIR: str = os.getenv(r"QUARANTINE_DIR", "cuarentena")
+    # Mapa de vendedores entre corridas (se invalida si cambia la tabla) y alta
+    # automática de los vendedores que no existen (ver VendorResolver)
+    VENDOR_CACHE: str = os.getenv(r"VENDOR_CACHE", "vendedores_cache.json")
+    VENDOR_AUTOREGISTER: bool = os.getenv(r"VENDOR_AUTOREGISTER", "0") == "1"
+    # Detalle por registro en ProcessTracker: uno de cada N (0 = solo errores)
+    TRACKER_SAMPLE_EVERY: int = int(os.getenv(r"TRACKER_SAMPLE_EVERY", "0"))
+    # Métricas de la carga en JSON y formato textfile de Prometheus (vacío = no)
+    METRICS_DIR: str = os.getenv(r"METRICS_DIR", "metricas")
+
+    # Cache de respuestas crudas (para --replay)
+    RAW_CACHE: bool = os.getenv(r"RAW_CACHE", "0") == "1"
+    RAW_CACHE_DIR: str = os.getenv(r"RAW_CACHE_DIR", "raw_cache")
+
+    @staticmethod
+    @functools.cache
+    def engine() -> Engine:
+        """Engine único del proceso, creado en el primer uso con la
+        configuración de pool de arriba (la app de escritorio lo reusa entre
+        corridas)."""
+        if not Paths.ENGINE_PATH:
+            raise RuntimeError("Falta ENGINE_PATH en el entorno / .env")
+        url = make_url(Paths.ENGINE_PATH)
+        opciones: dict = dict(
+            pool_pre_ping=Paths.DB_POOL_PRE_PING,
+            pool_recycle=Paths.DB_POOL_RECYCLE,
+            insertmanyvalues_page_size=Paths.DB_INSERT_PAGE_SIZE,
+        )
+        # SQLite usa su propio pool (sin tamaño configurable)
+        if url.get_backend_name() != "sqlite":
+            opciones.update(
+                pool_size=Paths.DB_POOL_SIZE, max_overflow=Paths.DB_MAX_OVERFLOW
+            )
+        if Paths.DB_ISOLATION_LEVEL:
+            opciones["isolation_level"] = Paths.DB_ISOLATION_LEVEL
+        if Paths.DB_FAST_EXECUTEMANY and url.get_backend_name() == "mssql":
+            opciones["fast_executemany"] = True
+        return create_engine(url, **opciones)
@@ -0,0 +1,174 @@
+import hashlib, json, logging, os
+import pandas as pd
+from sqlalchemy import insert, text
+from sqlmodel import select, Session
+from Pipeline.model import Vendedor
+from Pipeline.frames import Frames
+from Pipeline.loggins_system import ProcessTracker
+
+
+class VendorResolver:
+    """Resolución de ``vendedor`` → ``vendedor_id`` para todas las tablas.
+
+    Los nombres de Traffic / Oddo y los de ``vendedores`` se normalizan igual
+    (sin espacios, en mayúscula y sin acentos) y se cruzan con un solo
+    ``merge``. Con ``register=True`` los vendedores que no existen en ninguno
+    de los dos campos se dan de alta en un único ``INSERT`` (apagado por
+    defecto: ``Paths.VENDOR_AUTOREGISTER``).
+
+    La tabla ``vendedores`` se guarda en ``cache_path`` junto con su checksum:
+    mientras el checksum no cambie no se vuelve a leer entre corridas.
+    """
+
+    COLUMNAS: list = ["vendedor_id", "nombre_completo", "nombre"]
+
+    def __init__(self, cache_path: str | None = None, register: bool = False):
+        self.cache_path = cache_path
+        self.register = register
+        self._checksum: str | None = None
+        self._tabla: pd.DataFrame | None = None
+
+    @staticmethod
+    def normalize(serie: pd.Series) -> pd.Series:
+        from Pipeline.functions import ProcessData
+
+        def normalizar(nombre):
+            if nombre is None or nombre != nombre:
+                return None
+            return ProcessData.quitar_acentos(str(nombre).strip().upper()) or None
+
+        return ProcessData.map_unique(serie, normalizar)
+
+    @staticmethod
+    def checksum(session: Session) -> str:
+        """``CHECKSUM TABLE`` en MySQL; en otras bases, un hash de los valores
+        (``vendedor_id``, ``nombre_completo``, ``nombre``) de todas las filas."""
+        if session.get_bind().dialect.name == "mysql":
+            fila = session.execute(text("CHECKSUM TABLE vendedores")).one()
+            return str(fila[1])
+        filas = session.exec(
+            select(
+                Vendedor.vendedor_id, Vendedor.nombre_completo, Vendedor.nombre
+            ).order_by(Vendedor.vendedor_id)
+        ).all()
+        return hashlib.sha1(json.dumps([list(f) for f in filas]).encode()).hexdigest()
+
+    def table(self, session: Session) -> pd.DataFrame:
+        """``vendedores`` (id, nombre_completo, nombre), del cache si el
+        checksum no cambió."""
+        checksum = VendorResolver.checksum(session)
+        if self._tabla is not None and self._checksum == checksum:
+            return self._tabla
+
+        if self.cache_path and os.path.exists(self.cache_path):
+            with open(self.cache_path, encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("checksum") == checksum:
+                self._checksum = checksum
+                self._tabla = pd.DataFrame(
+                    cache["filas"], columns=VendorResolver.COLUMNAS
+                )
+                return self._tabla
+
+        filas = [
+            {
+                "vendedor_id": v.vendedor_id,
+                "nombre_completo": v.nombre_completo,
+                "nombre": v.nombre,
+            }
+            for v in session.exec(select(Vendedor)).all()
+        ]
+        if self.cache_path:
+            with open(self.cache_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"checksum": checksum, "filas": filas}, f)
+            os.replace(self.cache_path + ".tmp", self.cache_path)
+        self._checksum = checksum
+        self._tabla = pd.DataFrame(filas, columns=VendorResolver.COLUMNAS)
+        return self._tabla
+
+    def ids(self, nombres: pd.Series, campo: str, session: Session) -> pd.Series:
+        """``vendedor_id`` (``Int64``, nulo si no existe) para ``nombres`` ya
+        normalizados, cruzando contra ``campo`` de ``vendedores``."""
+        tabla = self.table(session)
+        mapa = pd.DataFrame(
+            {
+                "vendedor": VendorResolver.normalize(tabla[campo]),
+                "vendedor_id": tabla["vendedor_id"],
+            }
+        ).drop_duplicates("vendedor", keep="first")
+        cruce = pd.DataFrame({"vendedor": nombres.to_numpy()}).merge(
+            mapa, on="vendedor", how="left"
+        )
+        return cruce["vendedor_id"].astype("Int64")
+
+    def register_vendors(
+        self, session: Session, nombres: list[str], logger: logging.Logger
+    ) -> None:
+        """Alta de ``nombres`` (ya normalizados) en un solo ``INSERT``, con el
+        nombre en los dos campos. Los que ya existen en ``nombre_completo`` o
+        en ``nombre`` no se dan de alta, para no duplicar un vendedor que
+        figura con otro nombre en la otra fuente: quedan en el log para
+        revisarlos a mano."""
+        tabla = self.table(session)
+        conocidos = set(VendorResolver.normalize(tabla["nombre_completo"])) | set(
+            VendorResolver.normalize(tabla["nombre"])
+        )
+        revisar = [n for n in nombres if n in conocidos]
+        if revisar:
+            logger.warning(
+                f"  ⚠️  {len(revisar)} vendedores existen en el otro campo de "
+                f"vendedores y no se registran: {', '.join(map(repr, revisar))}"
+            )
+        filas = [
+            {"nombre_completo": n[:150], "nombre": n[:50]}
+            for n in nombres
+            if n not in conocidos
+        ]
+        if not filas:
+            return
+        session.execute(insert(Vendedor.__table__).values(filas))
+        session.commit()
+        logger.info(f"  👤 {len(filas)} vendedores nuevos registrados")
+
+    def resolve(
+        self,
+        df,
+        model,
+        session: Session,
+        logger: logging.Logger,
+        tracker: ProcessTracker,
+    ):
+        """Agrega ``vendedor_id`` a ``df`` según ``model.__vendor_field__`` y
+        quita las filas sin vendedor (van al tracker con un solo aviso)."""
+        campo = model.__vendor_field__
+        key = model.__natural_key__
+        vendedores = Frames.column_to_pandas(df, "vendedor").astype(object)
+        nombres = VendorResolver.normalize(vendedores)
+
+        ids = self.ids(nombres, campo, session)
+        faltan = ids.isna() & nombres.notna().to_numpy()
+        if self.register and faltan.any():
+            self.register_vendors(
+                session, list(dict.fromkeys(nombres[faltan.to_numpy()])), logger
+            )
+            ids = self.ids(nombres, campo, session)
+
+        sin_vendedor = ids.isna().to_numpy()
+        if sin_vendedor.any():
+            desconocidos = list(dict.fromkeys(vendedores[sin_vendedor].fillna("")))
+            logger.warning(
+                f"  ⚠️  {int(sin_vendedor.sum())} filas de {model.__tablename__} "
+                f"sin vendedor ({len(desconocidos)} desconocidos: "
+                f"{', '.join(map(repr, desconocidos[:10]))}"
+                f"{', ...' if len(desconocidos) > 10 else ''})"
+            )
+            claves = Frames.column_to_pandas(df, key)
+            for clave, vendedor in zip(
+                claves[sin_vendedor].tolist(), vendedores[sin_vendedor].tolist()
+            ):
+                tracker.add_error(clave, f"Vendedor '{vendedor}' no encontrado")
+
+        encontrados = ids[~sin_vendedor].astype("int64").to_numpy()
+        return Frames.with_column(
+            Frames.filter(df, ~sin_vendedor), "vendedor_id", encontrados
+        )
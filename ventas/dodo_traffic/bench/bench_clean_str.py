@@ -0,0 +1,70 @@
+"""Benchmark de la limpieza de strings de ProcessData sobre reservas sintéticas.
+
+Compara la versión anterior (lambda celda por celda + quitar_acentos por fila)
+con la vectorizada (``.str`` + una pasada por valor distinto) y verifica que
+den el mismo resultado.
+
+Uso (desde ventas/dodo_traffic):  python -m bench.bench_clean_str [filas]
+"""
+
+import sys, time
+import numpy as np
+import pandas as pd
+
+from Pipeline.functions import ProcessData
+
+
+def reservas_sinteticas(filas: int, seed: int = 0) -> pd.DataFrame:
+    """Columnas de texto de reservas con la cardinalidad real: pocos cientos de
+    vendedores y clientes, estados y monedas de un puñado de valores."""
+    rng = np.random.default_rng(seed)
+    vendedores = [f"  Vendedor Ñandú {i} Pérez " for i in range(200)] + [None, ""]
+    clientes = [f"cliente {i} s.a. " for i in range(800)] + [None]
+    return pd.DataFrame(
+        {
+            "reserva": [f"{i:06d}" for i in range(filas)],
+            "tipo_reserva": rng.choice(["fit ", "grp", " b2b", None], filas),
+            "cliente": rng.choice(np.array(clientes, dtype=object), filas),
+            "nombre_grupo": rng.choice(
+                np.array([f"grupo {i}" for i in range(5000)], dtype=object), filas
+            ),
+            "estado": rng.choice(["ok", "cx ", "pc", "op"], filas),
+            "moneda": rng.choice(["u$d", "ar$", None], filas),
+            "vendedor": rng.choice(np.array(vendedores, dtype=object), filas),
+        }
+    )
+
+
+def limpieza_anterior(df: pd.DataFrame) -> pd.DataFrame:
+    for col in df.select_dtypes(include="object").columns:
+        df[col] = df[col].apply(
+            lambda x: (x.strip().upper() if pd.notna(x) and str(x).strip() else None)
+        )
+    df["vendedor"] = df["vendedor"].apply(ProcessData.quitar_acentos)
+    return df
+
+
+def limpieza_nueva(df: pd.DataFrame) -> pd.DataFrame:
+    df = ProcessData.clean_str(df, df.select_dtypes(include="object").columns)
+    df["vendedor"] = ProcessData.map_unique(df["vendedor"], ProcessData.quitar_acentos)
+    return df
+
+
+def medir(fn, df: pd.DataFrame) -> tuple[float, pd.DataFrame]:
+    inicio = time.perf_counter()
+    resultado = fn(df.copy())
+    return time.perf_counter() - inicio, resultado
+
+
+if __name__ == "__main__":
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = reservas_sinteticas(filas)
+
+    t_anterior, anterior = medir(limpieza_anterior, df)
+    t_nueva, nueva = medir(limpieza_nueva, df)
+
+    pd.testing.assert_frame_equal(anterior, nueva)
+    print(f"Filas: {filas:,}")
+    print(f"Anterior:    {t_anterior:8.2f} s")
+    print(f"Vectorizada: {t_nueva:8.2f} s")
+    print(f"Speedup:     {t_anterior / t_nueva:8.1f}x  (resultados idénticos)")
@@ -0,0 +1,110 @@
+"""Paridad y tiempos de los motores de ProcessData ("pandas" vs "arrow").
+
+Genera reservas y presupuestos sintéticos con la forma de las respuestas de
+Traffic (strings con espacios, nulos, duplicados, fechas ISO, importes con
+muchos decimales), los procesa con los dos motores y verifica que el loader
+reciba exactamente las mismas filas (``Schema.to_records``).
+
+Uso (desde ventas/dodo_traffic):  python -m bench.bench_engines [filas]
+"""
+
+import sys, time
+import numpy as np
+import pandas as pd
+
+from Pipeline.functions import ProcessData
+from Pipeline.schema import Schema
+
+
+def fechas(rng, filas: int, con_hora: bool, nulos: float = 0.0) -> np.ndarray:
+    base = np.datetime64("2024-01-01T00:00:00")
+    valores = base + rng.integers(0, 730 * 86400, filas).astype("timedelta64[s]")
+    if not con_hora:
+        valores = valores.astype("datetime64[D]").astype("datetime64[s]")
+    texto = np.datetime_as_string(valores, unit="s").astype(object)
+    texto[rng.random(filas) < nulos] = None
+    return texto
+
+
+def traffic_sintetico(filas: int, presupuesto: bool, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    vendedores = [f"  Vendedor Ñandú {i} Pérez " for i in range(200)] + [None, ""]
+
+    def elegir(valores):
+        return rng.choice(np.array(valores, dtype=object), filas)
+
+    def importes(nulos: float = 0.02):
+        valores = rng.normal(1500, 900, filas) * rng.random(filas)
+        valores[rng.random(filas) < nulos] = np.nan
+        return valores
+
+    def enteros(maximo: int):
+        valores = rng.integers(0, maximo, filas).astype(float)
+        valores[rng.random(filas) < 0.05] = np.nan
+        return valores
+
+    # ~1% de reservas repetidas y algunas nulas, como llegan de Traffic
+    numeros = rng.integers(0, filas * 50, filas)
+    reservas = np.array([f"{i:08d}" for i in numeros], dtype=object)
+    reservas[rng.random(filas) < 0.001] = None
+
+    df = pd.DataFrame(
+        {
+            "Idpresupu" if presupuesto else "Idreserva": np.arange(filas),
+            "Rva": reservas,
+            "Tiporva": elegir(["fit ", "grp", " b2b", None]),
+            "Fec_mod": fechas(rng, filas, con_hora=True),
+            "Fec_rva": fechas(rng, filas, con_hora=False),
+            "Fec_sal": fechas(rng, filas, con_hora=False, nulos=0.01),
+            "Nombreagencia_cod_agcia": elegir(
+                [f"cliente {i} s.a. " for i in range(800)]
+            ),
+            "Estado": elegir(["ok", "cx ", "pc", "op"]),
+            "Can_adu": enteros(6),
+            "Can_chd": enteros(4),
+            "Moneda": elegir(["u$d", "ar$", None]),
+            "Nombrevendedor_cod_vdor": elegir(vendedores),
+            "Total": importes(),
+        }
+    )
+    if presupuesto:
+        df["Observ"] = elegir([f"grupo {i}" for i in range(5000)])
+        df["costoConIva"] = importes()
+        df["GananciaTotal"] = importes()
+        df["Productos"] = importes(0.5)
+    else:
+        df["Fec_fin"] = fechas(rng, filas, con_hora=False, nulos=0.05)
+        df["Nombregrupo"] = elegir([f"grupo {i}" for i in range(5000)])
+        df["gananciaTotal"] = importes()
+        df["Tipocont"] = elegir(["aereo", "terrestre", None])
+        df["Descripparame_productos"] = elegir(["hotel", "traslado", "excursion "])
+    return df
+
+
+def medir(fn, df: pd.DataFrame, engine: str):
+    inicio = time.perf_counter()
+    resultado = fn(df.copy(), engine=engine)
+    return time.perf_counter() - inicio, resultado
+
+
+def comparar(nombre: str, fn, df: pd.DataFrame) -> None:
+    t_pandas, con_pandas = medir(fn, df, "pandas")
+    t_arrow, con_arrow = medir(fn, df, "arrow")
+
+    filas_pandas = Schema.to_records(con_pandas)
+    filas_arrow = Schema.to_records(con_arrow)
+    assert len(filas_pandas) == len(filas_arrow), (len(filas_pandas), len(filas_arrow))
+    for i, (a, b) in enumerate(zip(filas_pandas, filas_arrow)):
+        assert a == b, f"{nombre}, fila {i}:\n  pandas: {a}\n  arrow:  {b}"
+
+    print(f"{nombre}: {len(filas_pandas):,} filas procesadas (resultados idénticos)")
+    print(f"  pandas: {t_pandas:8.2f} s")
+    print(f"  arrow:  {t_arrow:8.2f} s  ({t_pandas / t_arrow:.1f}x)")
+
+
+if __name__ == "__main__":
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    comparar("Reservas", ProcessData.process_rva, traffic_sintetico(filas, False))
+    comparar(
+        "Presupuestos", ProcessData.process_pres, traffic_sintetico(filas, True, 1)
+    )
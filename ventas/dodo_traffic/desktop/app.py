@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 from tkcalendar import Calendar
-import sys, os
+import sys, os, queue
 import datetime
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -12,20 +12,35 @@ from Pipeline.etl import main_etl
 from Pipeline.functions import Loader
 from Pipeline.model import Vendedor
 from sqlmodel import Session
-from Pipeline.utils import Paths  # donde está tu ENGINE
+from Pipeline.utils import Paths  # Paths.engine() crea el engine
 
 # -------------------------------------------------------
 # Redirección de consola
 # -------------------------------------------------------
 class ConsoleRedirect:
-    """Redirige stdout/stderr a un widget Text de tkinter"""
+    """Redirige stdout/stderr a un widget Text de tkinter.
 
-    def __init__(self, text_widget):
+    El logging escribe desde el hilo del QueueListener: los mensajes se
+    encolan y el hilo de Tk los vuelca en el widget cada ``intervalo`` ms.
+    """
+
+    def __init__(self, text_widget, intervalo=100):
         self.text_widget = text_widget
+        self.intervalo = intervalo
+        self.pendientes = queue.SimpleQueue()
+        self.text_widget.after(self.intervalo, self.volcar)
 
     def write(self, msg):
-        self.text_widget.insert(tk.END, msg)
-        self.text_widget.see(tk.END)  # autoscroll
+        self.pendientes.put(msg)
+
+    def volcar(self):
+        partes = []
+        while not self.pendientes.empty():
+            partes.append(self.pendientes.get_nowait())
+        if partes:
+            self.text_widget.insert(tk.END, "".join(partes))
+            self.text_widget.see(tk.END)  # autoscroll
+        self.text_widget.after(self.intervalo, self.volcar)
 
     def flush(self):
         pass
@@ -73,7 +88,7 @@ def on_create_vendor():
         return
 
     try:
-        with Session(Paths.ENGINE) as session:
+        with Session(Paths.engine()) as session:
             Loader.create_vendor(nombre_completo, nombre, session)
             session.commit()
         messagebox.showinfo("Éxito", f"Vendedor '{nombre_completo}' agregado correctamente.")
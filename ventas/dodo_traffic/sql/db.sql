@@ -31,6 +31,7 @@ CREATE TABLE
         ganancia DECIMAL(15, 2),
         productos VARCHAR(255),
         vendedor_id INT,
+        row_hash BIGINT,
         FOREIGN KEY (vendedor_id) REFERENCES vendedores (vendedor_id)
     );
 
@@ -55,6 +56,7 @@ CREATE TABLE
         eje_reservas_para VARCHAR(200),
         descrip_productos VARCHAR(255),
         vendedor_id INT,
+        row_hash BIGINT,
         FOREIGN KEY (vendedor_id) REFERENCES vendedores (vendedor_id)
     );
 
@@ -66,9 +68,26 @@ CREATE TABLE
         ganancia_esperada VARCHAR(100),
         estado VARCHAR(50),
         vendedor_id INT,
+        row_hash BIGINT,
         FOREIGN KEY (vendedor_id) REFERENCES vendedores (vendedor_id)
     );
 
+-- Clave natural única: necesaria para el upsert masivo (ON DUPLICATE KEY)
+CREATE UNIQUE INDEX ux_presupuestos_reserva ON presupuestos (reserva);
+
+CREATE UNIQUE INDEX ux_reservas_reserva ON reservas (reserva);
+
+-- En una base existente, borrar antes los oddos repetidos por nombre_grupo
+CREATE UNIQUE INDEX ux_oddos_nombre_grupo ON oddos (nombre_grupo);
+
+-- Marcas de agua para la sincronización incremental
+CREATE TABLE
+    sync_state (
+        fuente VARCHAR(50) PRIMARY KEY,
+        marca DATETIME,
+        actualizado DATETIME
+    );
+
 INSERT INTO
     vendedores (nombre_completo, nombre)
 VALUES
@@ -0,0 +1,31 @@
+import os, sys
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+
+# Los tests corren desde ventas/dodo_traffic (mismo import que etl y bench)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def nuevo_engine(tmp_path):
+    """Fábrica de bases SQLite con las tablas creadas y la mitad de los
+    vendedores de ``traffic_sintetico`` (el resto queda sin vendedor)."""
+    from Pipeline.model import Vendedor
+
+    def crear(nombre: str = "test"):
+        engine = create_engine(f"sqlite:///{tmp_path / nombre}.db")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            for i in range(100):
+                nombre_completo = f"VENDEDOR NANDU {i} PEREZ"
+                session.add(Vendedor(nombre_completo=nombre_completo, nombre="x"))
+            session.commit()
+        return engine
+
+    return crear
+
+
+@pytest.fixture
+def engine(nuevo_engine):
+    return nuevo_engine()
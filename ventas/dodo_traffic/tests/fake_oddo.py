@@ -0,0 +1,138 @@
+"""Servidor Odoo falso para probar ``OddoClient`` sin tocar producción.
+
+Implementa solo ``/web/session/authenticate`` y ``search_read`` de
+``/web/dataset/call_kw`` sobre una lista de leads en memoria::
+
+    with FakeOddo(leads) as url:
+        OddoClient(url, "db", "user", "pass").get_leads()
+
+Solo para los tests; desde la consola (en ``ventas/dodo_traffic``):
+``python tests/fake_oddo.py`` (imprime la URL).
+"""
+
+import json, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SESSION_COOKIE = "session_id=fake-session"
+
+LEADS_DEMO: list = [
+    {
+        "id": i,
+        "name": f"GRUPO {i}",
+        "email_from": f"cliente{i}@example.com",
+        "user_id": [1, "Agostina Mancinelli"] if i % 2 else [2, "Anahí Díaz"],
+        "expected_revenue": 1500.5 * i,
+        "stage_id": [1, "Propuesta Enviada"] if i % 3 else [2, "Confirmado"],
+        "type": "opportunity",
+        "write_date": f"2025-01-{i % 28 + 1:02d} 10:00:00",
+    }
+    for i in range(1, 251)
+]
+
+
+class FakeOddo:
+    def __init__(
+        self,
+        leads: list[dict] | None = None,
+        login: str = "user",
+        password: str = "pass",
+        port: int = 0,
+    ):
+        self.leads = LEADS_DEMO if leads is None else leads
+        self.login = login
+        self.password = password
+        self.requests: list = []  # payloads recibidos, para inspeccionar
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> str:
+        self.thread.start()
+        return self.url
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    @staticmethod
+    def match(lead: dict, domain: list) -> bool:
+        """Dominio simple: lista de condiciones [campo, op, valor] unidas por AND."""
+        ops = {
+            "=": lambda a, b: a == b,
+            "!=": lambda a, b: a != b,
+            ">": lambda a, b: a is not None and a > b,
+            ">=": lambda a, b: a is not None and a >= b,
+            "<": lambda a, b: a is not None and a < b,
+            "<=": lambda a, b: a is not None and a <= b,
+        }
+        return all(
+            ops[op](lead.get(campo), valor)
+            for campo, op, valor in (c for c in domain if isinstance(c, list))
+        )
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, payload: dict, cookie: bool = False) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if cookie:
+                    self.send_header("Set-Cookie", f"{SESSION_COOKIE}; Path=/")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _error(self, message: str) -> None:
+                self._reply({"jsonrpc": "2.0", "error": {"message": message}})
+
+            def do_POST(self):
+                size = int(self.headers.get("Content-Length", 0))
+                params = json.loads(self.rfile.read(size) or b"{}").get("params", {})
+                fake.requests.append((self.path, params))
+
+                if self.path == "/web/session/authenticate":
+                    if (params.get("login"), params.get("password")) != (
+                        fake.login,
+                        fake.password,
+                    ):
+                        return self._error("Access Denied")
+                    return self._reply({"jsonrpc": "2.0", "result": {"uid": 2}}, True)
+
+                if not self.path.startswith("/web/dataset/call_kw"):
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                if SESSION_COOKIE not in (self.headers.get("Cookie") or ""):
+                    return self._error("Session expired")
+
+                kwargs = params.get("kwargs", {})
+                domain = (params.get("args") or [[]])[0]
+                leads = sorted(
+                    (l for l in fake.leads if FakeOddo.match(l, domain)),
+                    key=lambda l: l[kwargs.get("order", "id").split()[0]],
+                )
+                offset = kwargs.get("offset", 0)
+                limit = kwargs.get("limit") or len(leads)
+                fields = kwargs.get("fields") or list(fake.leads[0].keys())
+                result = [
+                    {"id": l["id"], **{f: l.get(f, False) for f in fields}}
+                    for l in leads[offset : offset + limit]
+                ]
+                self._reply({"jsonrpc": "2.0", "result": result})
+
+        return Handler
+
+
+if __name__ == "__main__":
+    fake = FakeOddo(port=8069)
+    print(f"Odoo falso escuchando en {fake.url} (usuario 'user', clave 'pass')")
+    fake.server.serve_forever()
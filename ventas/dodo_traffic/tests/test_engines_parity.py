@@ -0,0 +1,91 @@
+"""Paridad entre los motores "pandas" y "arrow" de ``ProcessData``: el loader
+tiene que recibir exactamente las mismas filas (``Schema.to_records``)."""
+
+import numpy as np
+import pytest
+
+from bench.bench_engines import traffic_sintetico
+from Pipeline.functions import ProcessData
+from Pipeline.schema import Schema
+
+PROCESOS = {
+    "reservas": (ProcessData.process_rva, False),
+    "presupuestos": (ProcessData.process_pres, True),
+}
+
+
+def assert_paridad(fn, df):
+    con_pandas = Schema.to_records(fn(df.copy(), engine="pandas"))
+    con_arrow = Schema.to_records(fn(df.copy(), engine="arrow"))
+    assert len(con_pandas) == len(con_arrow)
+    for i, (a, b) in enumerate(zip(con_pandas, con_arrow)):
+        assert a == b, f"fila {i}:\n  pandas: {a}\n  arrow:  {b}"
+    return con_pandas
+
+
+@pytest.mark.parametrize("nombre", PROCESOS)
+def test_sinteticos(nombre):
+    fn, presupuesto = PROCESOS[nombre]
+    filas = assert_paridad(fn, traffic_sintetico(2000, presupuesto, seed=7))
+    assert filas
+
+
+@pytest.mark.parametrize("nombre", PROCESOS)
+def test_frame_vacio(nombre):
+    fn, presupuesto = PROCESOS[nombre]
+    assert assert_paridad(fn, traffic_sintetico(10, presupuesto).iloc[0:0]) == []
+
+
+def test_fecha_ausente_en_toda_la_pagina():
+    # Ninguna reserva trae Fec_fin: pandas arma la columna como float64 de NaN
+    df = traffic_sintetico(3, False)
+    df["Fec_fin"] = np.nan
+    filas = assert_paridad(ProcessData.process_rva, df)
+    assert [f["fecha_fin"] for f in filas] == [None, None, None]
+
+
+@pytest.mark.parametrize("nombre", PROCESOS)
+def test_vendedor_todo_nulo(nombre):
+    fn, presupuesto = PROCESOS[nombre]
+    df = traffic_sintetico(50, presupuesto)
+    df["Nombrevendedor_cod_vdor"] = None
+    filas = assert_paridad(fn, df)
+    # quitar_acentos deja los nulos como ""; lo importante es que coincidan
+    assert {f["vendedor"] for f in filas} <= {None, ""}
+
+
+def test_formatos_de_fecha_mezclados():
+    df = traffic_sintetico(6, False)
+    df["Fec_mod"] = [
+        "2024-03-01T10:20:30",
+        "2024-03-01T10:20:30.250",
+        "2024-03-02",
+        None,
+        "no es una fecha",
+        "2024-03-03T00:00:00",
+    ]
+    filas = assert_paridad(ProcessData.process_rva, df)
+    por_reserva = {f["reserva"]: f["ultima_modif"] for f in filas}
+    esperadas = {r: d for r, d in zip(df["Rva"], df["Fec_mod"]) if r in por_reserva}
+    for reserva, texto in esperadas.items():
+        fecha = por_reserva[reserva]
+        if texto is None or texto == "no es una fecha":
+            assert fecha is None
+        else:
+            assert fecha.isoformat() == texto[:10]
+
+
+def test_formatos_fuera_de_la_lista():
+    # Zona horaria u otras variantes: se infieren y conservan la hora local
+    df = traffic_sintetico(4, False)
+    df["Fec_mod"] = [
+        "2024-03-01T23:30:00Z",
+        "2024-03-02T23:30:00-03:00",
+        "2024-03-03T10:00:00.500+00:00",
+        "2024-03-04 10:00",
+    ]
+    filas = assert_paridad(ProcessData.process_rva, df)
+    por_reserva = {f["reserva"]: f["ultima_modif"] for f in filas}
+    for reserva, texto in zip(df["Rva"], df["Fec_mod"]):
+        if reserva in por_reserva:
+            assert por_reserva[reserva].isoformat() == texto[:10]
@@ -0,0 +1,33 @@
+"""``Frames`` responde igual con un ``DataFrame`` que con un ``pa.Table``."""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from Pipeline.frames import Frames
+
+DATOS = {"reserva": ["A", "B", "C"], "total": [10, 20, 30]}
+
+
+@pytest.fixture(params=["pandas", "arrow"])
+def lote(request):
+    df = pd.DataFrame(DATOS)
+    return df if request.param == "pandas" else pa.Table.from_pandas(df)
+
+
+def test_lectura(lote):
+    assert Frames.columns(lote) == ["reserva", "total"]
+    assert Frames.num_rows(lote) == 3
+    assert Frames.column_to_pandas(lote, "reserva").tolist() == DATOS["reserva"]
+    assert Frames.to_pandas(lote, ["total"]).columns.tolist() == ["total"]
+
+
+def test_filtro_y_columna_nueva(lote):
+    filtrado = Frames.filter(lote, np.array([True, False, True]))
+    filtrado = Frames.with_column(filtrado, "vendedor_id", np.array([7, 8]))
+    assert Frames.is_arrow(filtrado) == Frames.is_arrow(lote)
+    assert Frames.to_pandas(filtrado, ["reserva", "vendedor_id"]).to_dict("list") == {
+        "reserva": ["A", "C"],
+        "vendedor_id": [7, 8],
+    }
@@ -0,0 +1,63 @@
+"""Marca de agua del modo incremental: sale solo de las filas que
+``Loader.upsert`` dejó guardadas y no pasa de la primera que no se guardó."""
+
+import datetime, logging
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlmodel import Session, select
+
+from bench.bench_engines import traffic_sintetico
+from Pipeline.functions import Loader, ProcessData
+from Pipeline.incremental import Watermark
+from Pipeline.model import Reserva, SyncState
+
+logger = logging.getLogger("test")
+
+
+@pytest.mark.parametrize("strategy", ["orm", "bulk", "staging"])
+def test_upsert_devuelve_solo_guardadas(engine, strategy):
+    df = traffic_sintetico(600, False, seed=3)
+    df["Total"] = df["Total"].fillna(0)
+    df.loc[[10, 300], "Total"] = np.nan  # NOT NULL: van a cuarentena
+    reservas = ProcessData.process_rva(df)
+
+    for _ in range(2):  # la segunda vez todas las guardadas están sin cambios
+        with Session(engine) as session:
+            guardadas = Loader.upsert(
+                reservas.copy(), Reserva, session, logger, strategy=strategy
+            )
+        with Session(engine) as session:
+            en_base = set(session.exec(select(Reserva.reserva)).all())
+        assert set(guardadas["reserva"]) == en_base
+        assert 0 < len(guardadas) < len(reservas)
+
+
+def test_key_por_rango():
+    desde, hasta = datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)
+    assert Watermark.key("reservas", desde, hasta) == "reservas:20240101-20241231"
+    assert Watermark.key("oddo") == "oddo"
+
+
+def test_marca_retenida_por_pendientes(engine):
+    guardadas = pd.Series(pd.to_datetime(["2024-03-01", "2024-03-10"]))
+    pendientes = pd.Series(pd.to_datetime(["2024-03-05"]))
+    with Session(engine) as session:
+        Watermark.update(session, "reservas", guardadas, logger, pendientes)
+        session.commit()
+        marca = Watermark.get(session, "reservas")
+    assert marca == datetime.datetime(2024, 3, 4, 23, 59, 59)
+    # Traffic filtra por ">=" del día: la fila pendiente se vuelve a pedir
+    filas = pd.DataFrame({"ultima_modif": [datetime.date(2024, 3, 5)]})
+    assert len(Watermark.only_changed(filas, marca)) == 1
+
+
+def test_marca_avanza_sin_pendientes(engine):
+    guardadas = pd.Series(pd.to_datetime(["2024-03-01", "2024-03-10"]))
+    with Session(engine) as session:
+        Watermark.update(session, "reservas", guardadas, logger, guardadas.iloc[0:0])
+        session.commit()
+        assert session.get(SyncState, "reservas").marca == datetime.datetime(
+            2024, 3, 10
+        )
@@ -0,0 +1,58 @@
+"""``OddoClient`` contra ``FakeOddo``: login, paginación y filtro por
+``write_date``."""
+
+import datetime
+
+import pytest
+
+from fake_oddo import FakeOddo, LEADS_DEMO
+from Pipeline.oddo_client import OddoClient, OddoError
+
+
+def search_reads(fake: FakeOddo) -> list[dict]:
+    return [p for path, p in fake.requests if path.endswith("/search_read")]
+
+
+def test_paginacion():
+    fake = FakeOddo()
+    with fake as url:
+        df = OddoClient(url, "db", "user", "pass", batch_size=100).get_leads()
+
+    assert len(df) == len(LEADS_DEMO)
+    assert df["name"].tolist() == [l["name"] for l in LEADS_DEMO]
+    assert df["expected_revenue"].iloc[1] == "U$D 3.001,00"
+    assert df["user_id"].iloc[0] == "Agostina Mancinelli"
+    # 250 leads en lotes de 100: tres pedidos con offsets consecutivos
+    assert [p["kwargs"]["offset"] for p in search_reads(fake)] == [0, 100, 200]
+    assert all(p["kwargs"]["fields"] == OddoClient.FIELDS for p in search_reads(fake))
+
+
+def test_lote_exacto_pide_una_pagina_vacia():
+    fake = FakeOddo(LEADS_DEMO[:200])
+    with fake as url:
+        df = OddoClient(url, "db", "user", "pass", batch_size=100).get_leads()
+    assert len(df) == 200
+    assert [p["kwargs"]["offset"] for p in search_reads(fake)] == [0, 100, 200]
+
+
+def test_filtro_write_date():
+    desde = datetime.datetime(2025, 1, 20, 10, 0, 0)
+    fake = FakeOddo()
+    with fake as url:
+        df = OddoClient(url, "db", "user", "pass", batch_size=50).get_leads(desde)
+
+    esperados = [
+        l["name"] for l in LEADS_DEMO if l["write_date"] > "2025-01-20 10:00:00"
+    ]
+    assert esperados and len(esperados) < len(LEADS_DEMO)
+    assert df["name"].tolist() == esperados
+    for p in search_reads(fake):
+        assert p["args"][0] == OddoClient.DOMAIN + [
+            ["write_date", ">", "2025-01-20 10:00:00"]
+        ]
+
+
+def test_login_rechazado():
+    with FakeOddo() as url:
+        with pytest.raises(OddoError):
+            OddoClient(url, "db", "user", "otra").get_leads()
@@ -0,0 +1,54 @@
+"""Carpetas de ventanas de ``Sharding``: un reintento con los mismos parámetros
+reutiliza lo descargado; con otros parámetros del fetcher no."""
+
+import datetime, logging
+
+import pandas as pd
+
+from Pipeline.sharding import Sharding
+
+DESDE = datetime.date(2024, 1, 1)
+HASTA = datetime.date(2024, 3, 1)
+VENTANA = (DESDE, datetime.date(2024, 2, 1))
+
+
+def test_carpeta_depende_de_params(tmp_path):
+    ruta = lambda params: Sharding.shard_path(
+        "reservas", DESDE, HASTA, VENTANA, str(tmp_path), params
+    )
+    base = {"modificado_desde": None, "stream": False}
+    assert ruta(base) == ruta(dict(base))
+    assert ruta(base) != ruta({**base, "stream": True})
+    assert ruta(base) != ruta({**base, "modificado_desde": datetime.date(2024, 1, 15)})
+
+
+def test_reintento_no_mezcla_corridas(tmp_path):
+    llamadas = []
+
+    def fetcher(desde, hasta, cookies, marca):
+        llamadas.append((desde, marca))
+        if marca == "a" and desde == VENTANA[1]:
+            raise RuntimeError("ventana caída")
+        return pd.DataFrame({"desde": [desde], "marca": [marca]})
+
+    def fetch(marca):
+        return Sharding.fetch(
+            lambda d, h, c: fetcher(d, h, c, marca),
+            "reservas",
+            DESDE,
+            HASTA,
+            {},
+            logging.getLogger("test"),
+            retries=0,
+            shard_dir=str(tmp_path),
+            params={"marca": marca},
+        )
+
+    try:
+        fetch("a")
+    except RuntimeError:
+        pass
+    # La ventana de enero quedó guardada para "a", pero "b" la vuelve a pedir
+    df = fetch("b")
+    assert df["marca"].tolist() == ["b", "b"]
+    assert llamadas.count((DESDE, "b")) == 1
@@ -0,0 +1,52 @@
+"""``TrafficClient.paginate`` sin red: ``get_page`` se reemplaza por una página
+sintética que registra cuántas hay en vuelo."""
+
+import asyncio
+
+from Pipeline.traffic_client import RESERVAS, TrafficClient
+
+
+class ClienteFalso(TrafficClient):
+    def __init__(self, total: int, **kwargs):
+        super().__init__({}, page_size=10, **kwargs)
+        self.total = total
+        self.en_vuelo = 0
+        self.max_en_vuelo = 0
+        self.pedidas: list[int] = []
+
+    async def get_page(self, endpoint, body, skip, url=None):
+        self.pedidas.append(skip)
+        self.en_vuelo += 1
+        self.max_en_vuelo = max(self.max_en_vuelo, self.en_vuelo)
+        await asyncio.sleep(0)
+        self.en_vuelo -= 1
+        filas = range(skip, min(skip + self.page_size, self.total))
+        return {"TotalCount": self.total, "Entities": [{"Rva": i} for i in filas]}
+
+
+def paginas(cliente: TrafficClient) -> tuple[list[list[dict]], list[int]]:
+    """Páginas entregadas y, por cada una, cuántas se pidieron por delante."""
+
+    async def correr():
+        salida, adelantadas = [], []
+        async for page in cliente.paginate(RESERVAS, {}):
+            salida.append(page)
+            await asyncio.sleep(0.001)  # consumidor lento
+            adelantadas.append(len(cliente.pedidas) - len(salida))
+        return salida, adelantadas
+
+    return asyncio.run(correr())
+
+
+def test_paginas_en_orden():
+    cliente = ClienteFalso(95, max_connections=3)
+    salida, _ = paginas(cliente)
+    assert [f["Rva"] for page in salida for f in page] == list(range(95))
+
+
+def test_lanza_solo_max_connections_por_delante():
+    cliente = ClienteFalso(200, max_connections=3)
+    salida, adelantadas = paginas(cliente)
+    assert len(salida) == 20 and len(cliente.pedidas) == 20
+    assert max(adelantadas) == cliente.max_connections
+    assert cliente.max_en_vuelo <= cliente.max_connections
@@ -0,0 +1,35 @@
+"""``VendorResolver``: checksum del cache y alta automática de vendedores."""
+
+import logging
+
+from sqlmodel import Session, select
+
+from Pipeline.model import Vendedor
+from Pipeline.vendors import VendorResolver
+
+logger = logging.getLogger("test")
+
+
+def test_checksum_cambia_con_renombre_del_mismo_largo(engine):
+    with Session(engine) as session:
+        antes = VendorResolver.checksum(session)
+        vendedor = session.get(Vendedor, 1)
+        vendedor.nombre_completo = vendedor.nombre_completo[::-1]
+        session.add(vendedor)
+        session.commit()
+        assert VendorResolver.checksum(session) != antes
+
+
+def test_alta_no_duplica_el_otro_campo(engine):
+    with Session(engine) as session:
+        session.add(Vendedor(nombre_completo="ANA MARIA DIAZ", nombre="ANA DIAZ"))
+        session.commit()
+        total = len(session.exec(select(Vendedor)).all())
+
+        # "ANA DIAZ" ya existe como nombre corto: no se registra de nuevo
+        VendorResolver(register=True).register_vendors(
+            session, ["ANA DIAZ", "NUEVO VENDEDOR"], logger
+        )
+        nombres = session.exec(select(Vendedor.nombre_completo)).all()
+    assert len(nombres) == total + 1
+    assert "NUEVO VENDEDOR" in nombres and "ANA DIAZ" not in nombres